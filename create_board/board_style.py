@@ -0,0 +1,8 @@
+"""Color scheme shared by the terminal board and the headless renderer."""
+
+LIGHT_SQUARE = "#EEEED2"
+DARK_SQUARE = "#779756"
+WHITE_PIECE = "#BBB3A2"
+BLACK_PIECE = "#000000"
+TAG_FOREGROUND = "#F6F4EB"
+TAG_BACKGROUND = "#302E2A"
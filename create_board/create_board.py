@@ -3,6 +3,15 @@ from rich.style import Style
 from rich.table import Table
 from rich import print
 from highlight_moves import HighlightMove
+from .board_style import (
+    BLACK_PIECE,
+    DARK_SQUARE,
+    LIGHT_SQUARE,
+    TAG_BACKGROUND,
+    TAG_FOREGROUND,
+    WHITE_PIECE,
+)
+from engine.position import Position
 from .place_pieces import PlacePiece
 
 
@@ -31,6 +40,8 @@ class CreateBoard:
         self.console = Console()
         self.piece = PlacePiece()
         self.highlight_move = HighlightMove(move, previous_square)
+        self.move = move
+        self.previous_square = previous_square
         self.square_color = None
         self.updated_game = updated_game
         self.player = player
@@ -40,6 +51,13 @@ class CreateBoard:
             if self.piece.game != self.updated_game:
                 self.piece.game = self.updated_game
 
+    def _get_check_square(self):
+        for color in ("w", "b"):
+            attack_state = Position.from_game(self.piece.game, color).attack_state
+            if attack_state.in_check:
+                return attack_state.king_square
+        return None
+
     def set_piece_color(self, piece):
         """Sets the color of a chess piece.
 
@@ -51,10 +69,10 @@ class CreateBoard:
         """
         if piece.startswith("W"):
             piece = piece.removeprefix("W")
-            piece_colored = f"[#BBB3A2]{piece.center(2)}"
+            piece_colored = f"[{WHITE_PIECE}]{piece.center(2)}"
         elif piece.startswith("B"):
             piece = piece.removeprefix("B")
-            piece_colored = f"[#000000]{piece.center(2)}"
+            piece_colored = f"[{BLACK_PIECE}]{piece.center(2)}"
         else:
             piece_colored = f"{piece.center(2)}"
         return piece_colored
@@ -62,15 +80,15 @@ class CreateBoard:
     def set_board_color(self):
         """Sets the board color and prints the chessboard."""
 
-        light_color_square = "#EEEED2"
-        dark_color_square = "#779756"
-
         column_tag = list("87654321")
 
         self._check_if_game_updated()
+        self.highlight_move.move = self.move
+        self.highlight_move.previous_square = self.previous_square
+        self.highlight_move.check_square = self._get_check_square()
 
         for i in range(8):
-            print(f"[#F6F4EB on #302E2A]{column_tag[i]} ", end="")
+            print(f"[{TAG_FOREGROUND} on {TAG_BACKGROUND}]{column_tag[i]} ", end="")
             for j in range(8):
                 piece = self.piece.game[i * 8 + j].upper()
 
@@ -78,9 +96,9 @@ class CreateBoard:
                     self.square_color = Style(bgcolor=self.highlight_move.highlight_move(i, j))
                 # sets board color
                 elif (i + j) % 2 == 0:
-                    self.square_color = Style(bgcolor=light_color_square)
+                    self.square_color = Style(bgcolor=LIGHT_SQUARE)
                 else:
-                    self.square_color = Style(bgcolor=dark_color_square)
+                    self.square_color = Style(bgcolor=DARK_SQUARE)
 
                 self.console.print(
                     self.set_piece_color(piece=piece), style=self.square_color, end=""
@@ -102,7 +120,7 @@ class CreateBoard:
         )
 
         for tag, _ in enumerate(row_tag):
-            self.console.print(f"[#F6F4EB on #302E2A] {row_tag[tag]}", end="")
+            self.console.print(f"[{TAG_FOREGROUND} on {TAG_BACKGROUND}] {row_tag[tag]}", end="")
         print()
 
         self.set_board_color()
@@ -0,0 +1,274 @@
+"""Headless board rendering for exporting game diagrams.
+
+Unlike `CreateBoard`, nothing here prints: every diagram is returned as a
+string, so positions can be rendered in bulk from worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from engine.position import SQUARE_NAMES, Position
+from highlight_moves import HighlightMove
+from .board_style import (
+    BLACK_PIECE,
+    DARK_SQUARE,
+    LIGHT_SQUARE,
+    TAG_BACKGROUND,
+    TAG_FOREGROUND,
+    WHITE_PIECE,
+)
+
+
+FORMATS = {"text": "txt", "ansi": "ans", "svg": "svg", "html": "html"}
+SQUARE_SIZE = 45
+
+_BASE_COLORS = [
+    LIGHT_SQUARE if (index // 8 + index % 8) % 2 == 0 else DARK_SQUARE
+    for index in range(64)
+]
+# (format, background, piece) -> rendered square; squares repeat a lot
+# across diagrams, so each combination is only formatted once.
+_fragments = {}
+
+
+def _label(piece):
+    return piece[1].upper() if piece != " " else ""
+
+
+def _text_label(piece):
+    # Plain text has no colors, so black pieces are lowercase as in FEN.
+    if piece == " ":
+        return "."
+    return piece[1].upper() if piece[0] == "w" else piece[1]
+
+
+def _piece_color(piece):
+    return WHITE_PIECE if piece[0] == "w" else BLACK_PIECE
+
+
+def _ansi_color(hex_color, layer):
+    red, green, blue = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"\x1b[{layer};2;{red};{green};{blue}m"
+
+
+def _ansi_square(background, piece):
+    text = _ansi_color(background, 48)
+    if piece != " ":
+        text += _ansi_color(_piece_color(piece), 38)
+    return text + _label(piece).center(2)
+
+
+def _svg_square(index, background, piece):
+    x = index % 8 * SQUARE_SIZE + SQUARE_SIZE // 2
+    y = index // 8 * SQUARE_SIZE
+    text = (
+        f'<rect x="{x}" y="{y}" width="{SQUARE_SIZE}" height="{SQUARE_SIZE}" '
+        f'fill="{background}"/>'
+    )
+    if piece != " ":
+        text += (
+            f'<text x="{x + SQUARE_SIZE // 2}" y="{y + SQUARE_SIZE // 2}" '
+            f'fill="{_piece_color(piece)}">{_label(piece)}</text>'
+        )
+    return text
+
+
+def _html_square(background, piece):
+    if piece == " ":
+        return f'<td style="background:{background}"></td>'
+    return (
+        f'<td style="background:{background};color:{_piece_color(piece)}">'
+        f"{_label(piece)}</td>"
+    )
+
+
+class RenderBoard:
+    """
+    Renders a chess position to text, ANSI, SVG or HTML without printing.
+
+    Attributes:
+        board (list): 64 squares in `PlacePiece` order, either UI pieces
+            ("wp5") or engine pieces ("wp").
+        highlight_move (HighlightMove): Last-move and check highlighting.
+    """
+
+    def __init__(self, board, move=None, previous_square=None, check_square=None) -> None:
+        self.board = board
+        self.highlight_move = HighlightMove(move, previous_square, check_square)
+
+    @classmethod
+    def from_position(cls, position, last_move=None):
+        """Creates a renderer for an engine position.
+
+        Args:
+            position (Position): The position to draw.
+            last_move (int): The packed move that led to it, if any.
+        """
+        move = previous_square = None
+        if last_move is not None:
+            previous_square = SQUARE_NAMES[last_move & 63]
+            move = SQUARE_NAMES[last_move >> 6 & 63]
+
+        attack_state = position.attack_state
+        check_square = attack_state.king_square if attack_state.in_check else None
+        return cls(position.board, move, previous_square, check_square)
+
+    def _square_colors(self):
+        colors = list(_BASE_COLORS)
+        highlight = self.highlight_move
+        if highlight.previous_square is None and highlight.check_square is None:
+            return colors
+
+        for index in range(64):
+            color = highlight.highlight_move(index // 8, index % 8)
+            if color:
+                colors[index] = color
+        return colors
+
+    def to_text(self):
+        """Returns the board as plain text, rank 8 at the top."""
+        rows = []
+        for row in range(8):
+            squares = self.board[row * 8:row * 8 + 8]
+            rows.append(
+                f"{8 - row} "
+                + "".join(_text_label(piece).center(2) for piece in squares)
+            )
+        rows.append("  " + "".join(file.center(2) for file in "abcdefgh"))
+        return "\n".join(rows) + "\n"
+
+    def to_ansi(self):
+        """Returns the board with 24-bit ANSI colors, like the terminal board."""
+        tag = _ansi_color(TAG_FOREGROUND, 38) + _ansi_color(TAG_BACKGROUND, 48)
+        colors = self._square_colors()
+        rows = [tag + "  " + "".join(f" {file}" for file in "abcdefgh") + "\x1b[0m"]
+        for row in range(8):
+            line = [f"{tag}{8 - row} "]
+            for index in range(row * 8, row * 8 + 8):
+                key = ("ansi", colors[index], self.board[index])
+                fragment = _fragments.get(key)
+                if fragment is None:
+                    fragment = _fragments[key] = _ansi_square(colors[index], self.board[index])
+                line.append(fragment)
+            rows.append("".join(line) + "\x1b[0m")
+        return "\n".join(rows) + "\n"
+
+    def to_svg(self):
+        """Returns the board as a standalone SVG document."""
+        colors = self._square_colors()
+        size = SQUARE_SIZE * 8
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{size + SQUARE_SIZE}" '
+            f'height="{size + SQUARE_SIZE // 2}" font-family="monospace" '
+            f'font-size="{SQUARE_SIZE // 2}" text-anchor="middle" '
+            f'dominant-baseline="central">',
+            f'<rect width="100%" height="100%" fill="{TAG_BACKGROUND}"/>',
+        ]
+        for index in range(64):
+            key = ("svg", index, colors[index], self.board[index])
+            fragment = _fragments.get(key)
+            if fragment is None:
+                fragment = _fragments[key] = _svg_square(index, colors[index], self.board[index])
+            parts.append(fragment)
+        parts.append(_svg_tags())
+        parts.append("</svg>")
+        return "".join(parts)
+
+    def to_html(self):
+        """Returns the board as an HTML table."""
+        colors = self._square_colors()
+        tag_style = f"background:{TAG_BACKGROUND};color:{TAG_FOREGROUND}"
+        rows = ['<table class="chess-board" style="border-collapse:collapse">']
+        for row in range(8):
+            cells = [f'<th style="{tag_style}">{8 - row}</th>']
+            for index in range(row * 8, row * 8 + 8):
+                key = ("html", colors[index], self.board[index])
+                fragment = _fragments.get(key)
+                if fragment is None:
+                    fragment = _fragments[key] = _html_square(colors[index], self.board[index])
+                cells.append(fragment)
+            rows.append("<tr>" + "".join(cells) + "</tr>")
+        rows.append(
+            f'<tr><th style="{tag_style}"></th>'
+            + "".join(f'<th style="{tag_style}">{file}</th>' for file in "abcdefgh")
+            + "</tr></table>"
+        )
+        return "".join(rows)
+
+    def render(self, format="text"):
+        """Renders the board in one of `FORMATS`."""
+        match format:
+            case "text":
+                return self.to_text()
+            case "ansi":
+                return self.to_ansi()
+            case "svg":
+                return self.to_svg()
+            case "html":
+                return self.to_html()
+        raise ValueError(f"Unknown format: {format}")
+
+
+def _svg_tags():
+    tags = []
+    for row in range(8):
+        tags.append(
+            f'<text x="{SQUARE_SIZE // 4}" y="{row * SQUARE_SIZE + SQUARE_SIZE // 2}" '
+            f'fill="{TAG_FOREGROUND}">{8 - row}</text>'
+        )
+    for file_index, file in enumerate("abcdefgh"):
+        tags.append(
+            f'<text x="{SQUARE_SIZE // 2 + file_index * SQUARE_SIZE + SQUARE_SIZE // 2}" '
+            f'y="{8 * SQUARE_SIZE + SQUARE_SIZE // 4}" fill="{TAG_FOREGROUND}">{file}</text>'
+        )
+    return "".join(tags)
+
+
+def render_game(game, format="svg"):
+    """Renders every position of a game, highlighting the move that led to it.
+
+    Args:
+        game (GameRecord): The game to render.
+        format (str): One of `FORMATS`.
+
+    Returns:
+        list: One diagram per position, starting with the initial one.
+    """
+    position = Position.from_fen(game.start_fen)
+    diagrams = [RenderBoard.from_position(position).render(format)]
+    for move in game.moves:
+        position.make_move(move)
+        diagrams.append(RenderBoard.from_position(position, move).render(format))
+    return diagrams
+
+
+def render_games(games, format="svg", workers=None, chunksize=16):
+    """Renders many games in a process pool.
+
+    Yields:
+        list: The diagrams of each game, in input order.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            partial(render_game, format=format), games, chunksize=chunksize
+        )
+
+
+def export_games(games, output_dir, format="svg", workers=None):
+    """Writes one file per position to output_dir/game-NNNNN/ply-NNN.<ext>.
+
+    Returns:
+        int: The number of diagrams written.
+    """
+    extension = FORMATS[format]
+    written = 0
+    for game_index, diagrams in enumerate(render_games(games, format, workers)):
+        game_dir = os.path.join(output_dir, f"game-{game_index:05d}")
+        os.makedirs(game_dir, exist_ok=True)
+        for ply, diagram in enumerate(diagrams):
+            path = os.path.join(game_dir, f"ply-{ply:03d}.{extension}")
+            with open(path, "w", encoding="utf-8") as diagram_file:
+                diagram_file.write(diagram)
+            written += 1
+    return written
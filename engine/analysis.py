@@ -0,0 +1,204 @@
+"""Persistent analysis of the positions of one game.
+
+The session keeps its transposition table, history scores and finished
+results between positions, so stepping through a game (or back and forth
+over the same moves) builds on earlier searches instead of starting cold.
+
+Example:
+    python -m engine.analysis --depth 5 --lines 3
+"""
+
+import argparse
+import time
+
+from .notation import move_to_san
+from .position import START_FEN, Position
+from .search import MATE_SCORE, MAX_PLY, Search
+from .move import FROM_TO_MASK
+from .transposition import DEFAULT_SIZE_MB, TranspositionTable
+
+
+DEFAULT_LINES = 3
+DEFAULT_MOVETIME = 1000
+
+# Morphy's Opera Game, used when no PGN is given to the benchmark.
+SAMPLE_GAME = (
+    "1. e4 e5 2. Nf3 d6 3. d4 Bg4 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 "
+    "8. Nc3 c6 9. Bg5 b5 10. Nxb5 cxb5 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 "
+    "14. Rd1 Qe6 15. Bxd7+ Nxd7 16. Qb8+ Nxb8 17. Rd8# 1-0"
+)
+
+
+def format_score(score):
+    """Formats a score in pawns from the side to move's view, e.g. "+0.35", "#3"."""
+    if score >= MATE_SCORE - MAX_PLY:
+        return f"#{(MATE_SCORE - score + 1) // 2}"
+    if score <= -MATE_SCORE + MAX_PLY:
+        return f"#-{(MATE_SCORE + score) // 2}"
+    return f"{score / 100:+.2f}"
+
+
+def format_line(position, pv):
+    """Formats a principal variation in SAN with move numbers."""
+    tokens = []
+    move_number = position.fullmove_number
+    for ply, move in enumerate(pv):
+        if position.side == "w":
+            tokens.append(f"{move_number}.")
+        elif ply == 0:
+            tokens.append(f"{move_number}...")
+        tokens.append(move_to_san(position, move))
+        position.make_move(move)
+        if position.side == "w":
+            move_number += 1
+    for _ in pv:
+        position.unmake_move()
+    return " ".join(tokens)
+
+
+class AnalysisResult:
+    """
+    Represents the analysis of one position.
+
+    Attributes:
+        depth (int): Deepest completed iteration.
+        lines (list): (score, pv) of the best moves, best first.
+        nodes (int): Nodes searched for this request; 0 if none were needed.
+        elapsed (float): Seconds spent searching for this request.
+        reused (bool): Whether the lines come from an earlier search of the
+            position.
+    """
+
+    def __init__(self, depth, lines, nodes, elapsed, reused=False) -> None:
+        self.depth = depth
+        self.lines = lines
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.reused = reused
+
+
+class AnalysisSession:
+    """
+    Analyses positions one after another, reusing earlier work.
+
+    Attributes:
+        lines (int): Number of best moves reported per position.
+        depth (int): Maximum search depth.
+        movetime (int): Time budget per position in milliseconds, or None.
+        transposition_table (TranspositionTable): Kept between positions.
+        history (list): Quiet-move history scores, kept between positions.
+        results (dict): Position hash -> AnalysisResult of earlier searches.
+    """
+
+    def __init__(
+        self, lines=DEFAULT_LINES, depth=MAX_PLY, movetime=DEFAULT_MOVETIME,
+        size_mb=DEFAULT_SIZE_MB,
+    ) -> None:
+        self.lines = lines
+        self.depth = depth
+        self.movetime = movetime
+        self.transposition_table = TranspositionTable(size_mb)
+        self.history = [0] * (FROM_TO_MASK + 1)
+        self.results = {}
+
+    def clear(self):
+        """Forgets everything, so the next analysis starts cold."""
+        self.transposition_table.clear()
+        self.history[:] = [0] * len(self.history)
+        self.results.clear()
+
+    def analyse(self, position):
+        """Returns the best lines for a position.
+
+        A position already analysed at least as deep as `depth` is answered
+        from `results` without searching; otherwise it is searched again with
+        the warm transposition table, which usually gets deeper than before.
+
+        Args:
+            position (Position): The position; it is left unchanged.
+
+        Returns:
+            AnalysisResult: The analysis.
+        """
+        previous = self.results.get(position.hash)
+        if previous is not None and previous.depth >= min(self.depth, MAX_PLY):
+            return AnalysisResult(previous.depth, previous.lines, 0, 0.0, reused=True)
+
+        search = Search(
+            position.copy(),
+            transposition_table=self.transposition_table,
+            history=self.history,
+        )
+        start = time.perf_counter()
+        search.go(depth=self.depth, movetime=self.movetime, multi_pv=self.lines)
+        result = AnalysisResult(
+            search.completed_depth,
+            search.lines,
+            search.stats.total_nodes,
+            time.perf_counter() - start,
+        )
+
+        # A time-limited search can end shallower than an earlier one.
+        if previous is not None and previous.depth > result.depth:
+            return AnalysisResult(previous.depth, previous.lines, result.nodes, result.elapsed, True)
+        self.results[position.hash] = result
+        return result
+
+    def report(self, position, result):
+        """Formats an analysis as one text line per variation."""
+        return [
+            f"{format_score(score):>7}  {format_line(position, pv)}"
+            for score, pv in result.lines
+        ]
+
+
+def compare_with_cold_searches(start_fen, moves, depth, lines=DEFAULT_LINES):
+    """Analyses every position of a game warm and cold, to a fixed depth.
+
+    The warm pass uses one session for the whole game, the way analysis mode
+    steps through it; the cold pass starts a fresh session per position.
+
+    Returns:
+        tuple: ((warm seconds, warm nodes), (cold seconds, cold nodes)).
+    """
+    totals = []
+    for warm in (True, False):
+        session = AnalysisSession(lines, depth, movetime=None)
+        position = Position.from_fen(start_fen)
+        seconds = nodes = 0
+        for move in [*moves, None]:
+            if not warm:
+                session.clear()
+            result = session.analyse(position)
+            seconds += result.elapsed
+            nodes += result.nodes
+            if move is not None:
+                position.make_move(move)
+        totals.append((seconds, nodes))
+    return tuple(totals)
+
+
+def main():
+    # Imported here so the engine package doesn't depend on game_store.
+    from game_store.pgn_store import PgnGameStore, parse_games
+
+    parser = argparse.ArgumentParser(description="Measure what analysis reuse saves.")
+    parser.add_argument("--pgn", help="analyse the first game of this PGN file")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--lines", type=int, default=DEFAULT_LINES)
+    args = parser.parse_args()
+
+    games = PgnGameStore(args.pgn).read() if args.pgn else parse_games([SAMPLE_GAME])
+    game = next(iter(games))
+    (warm_seconds, warm_nodes), (cold_seconds, cold_nodes) = compare_with_cold_searches(
+        game.start_fen or START_FEN, game.moves, args.depth, args.lines
+    )
+    saved = 100 * (1 - warm_seconds / cold_seconds) if cold_seconds else 0.0
+    print(f"positions: {len(game.moves) + 1}, depth {args.depth}, {args.lines} lines")
+    print(f"cold: {cold_seconds:.2f} s, {cold_nodes} nodes")
+    print(f"warm: {warm_seconds:.2f} s, {warm_nodes} nodes")
+    print(f"reuse saves {cold_seconds - warm_seconds:.2f} s ({saved:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+from .attacks import (
+    BETWEEN,
+    BISHOP_RAYS,
+    KING_BITBOARDS,
+    KNIGHT_ATTACKS,
+    KNIGHT_BITBOARDS,
+    OPPOSITE,
+    PAWN_ATTACKS,
+    PAWN_BITBOARDS,
+    ROOK_RAYS,
+)
+
+
+ALL_SQUARES = (1 << 64) - 1
+
+
+def _attacked_squares(board, color, transparent):
+    """Bitboard of every square `color` attacks; `transparent` counts as empty."""
+    attacked = 0
+    for square, piece in enumerate(board):
+        if piece[0] != color:
+            continue
+        kind = piece[1]
+        if kind == "p":
+            attacked |= PAWN_BITBOARDS[color][square]
+        elif kind == "n":
+            attacked |= KNIGHT_BITBOARDS[square]
+        elif kind == "k":
+            attacked |= KING_BITBOARDS[square]
+        else:
+            rays = ()
+            if kind == "r" or kind == "q":
+                rays += ROOK_RAYS[square]
+            if kind == "b" or kind == "q":
+                rays += BISHOP_RAYS[square]
+            for ray in rays:
+                for target in ray:
+                    attacked |= 1 << target
+                    if board[target] != " " and target != transparent:
+                        break
+    return attacked
+
+
+class AttackState:
+    """
+    Attack information for one position, computed once and shared by move
+    legality, check evasion and check highlighting.
+
+    Attributes:
+        side (str): The side to move the state was computed for.
+        king_square (int): The square of the side to move's king.
+        attacked (dict): Color -> bitboard of the squares that color attacks,
+            filled in by `attacks_by` on first use. Sliders see through the
+            opposing king, so the king can't step back along the line it is
+            attacked on.
+        checkers (int): Bitboard of the pieces giving check.
+        pinned (int): Bitboard of the side to move's pieces pinned to its king.
+        pin_rays (dict): Pinned square -> bitboard it may still move along.
+        check_mask (int): Squares a non-king move must land on: everything when
+            not in check, the checker and the blocking squares in single
+            check, nothing in double check.
+    """
+
+    def __init__(self, position) -> None:
+        board = position.board
+        side = position.side
+        enemy = OPPOSITE[side]
+        king = board.index(side + "k")
+
+        self.side = side
+        self.king_square = king
+        self.attacked = {}
+        self._board = board
+
+        # An enemy pawn checks from the squares our own pawn would attack.
+        self.checkers = 0
+        for square in PAWN_ATTACKS[side][king]:
+            if board[square] == enemy + "p":
+                self.checkers |= 1 << square
+        for square in KNIGHT_ATTACKS[king]:
+            if board[square] == enemy + "n":
+                self.checkers |= 1 << square
+
+        self.pinned = 0
+        self.pin_rays = {}
+        for rays, sliders in (
+            (ROOK_RAYS[king], (enemy + "r", enemy + "q")),
+            (BISHOP_RAYS[king], (enemy + "b", enemy + "q")),
+        ):
+            for ray in rays:
+                blocker = None
+                for square in ray:
+                    piece = board[square]
+                    if piece == " ":
+                        continue
+                    if piece[0] == side:
+                        if blocker is not None:
+                            break
+                        blocker = square
+                        continue
+                    if piece in sliders:
+                        if blocker is None:
+                            self.checkers |= 1 << square
+                        else:
+                            self.pinned |= 1 << blocker
+                            self.pin_rays[blocker] = BETWEEN[king][square] | 1 << square
+                    break
+
+        if not self.checkers:
+            self.check_mask = ALL_SQUARES
+        elif self.checkers & (self.checkers - 1):
+            self.check_mask = 0
+        else:
+            checker = self.checkers.bit_length() - 1
+            self.check_mask = self.checkers | BETWEEN[king][checker]
+
+    @property
+    def in_check(self):
+        return self.checkers != 0
+
+    @property
+    def double_check(self):
+        return self.checkers & (self.checkers - 1) != 0
+
+    def attacks_by(self, color):
+        """Returns the bitboard of squares `color` attacks."""
+        attacked = self.attacked.get(color)
+        if attacked is None:
+            board = self._board
+            opposing_king = board.index(OPPOSITE[color] + "k")
+            attacked = self.attacked[color] = _attacked_squares(board, color, opposing_king)
+        return attacked
+
+    def is_attacked(self, square, by_color):
+        return bool(self.attacks_by(by_color) >> square & 1)
@@ -0,0 +1,185 @@
+"""Precomputed attack tables for the engine.
+
+Squares follow the board list used by `PlacePiece`: index 0 is a8 and
+index 63 is h1, so white pawns move towards lower indices.
+"""
+
+WHITE = "w"
+BLACK = "b"
+OPPOSITE = {WHITE: BLACK, BLACK: WHITE}
+
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+ROOK_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def _on_board(row, file):
+    return 0 <= row < 8 and 0 <= file < 8
+
+
+def _leaper_table(offsets):
+    table = []
+    for square in range(64):
+        row, file = divmod(square, 8)
+        table.append(
+            tuple(
+                (row + row_offset) * 8 + file + file_offset
+                for row_offset, file_offset in offsets
+                if _on_board(row + row_offset, file + file_offset)
+            )
+        )
+    return table
+
+
+def _ray_table(directions):
+    table = []
+    for square in range(64):
+        rays = []
+        for row_offset, file_offset in directions:
+            row, file = divmod(square, 8)
+            ray = []
+            while True:
+                row += row_offset
+                file += file_offset
+                if not _on_board(row, file):
+                    break
+                ray.append(row * 8 + file)
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return table
+
+
+def _bitboard_table(table):
+    return [sum(1 << square for square in squares) for squares in table]
+
+
+KNIGHT_ATTACKS = _leaper_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _leaper_table(KING_OFFSETS)
+# Squares attacked *by* a pawn of the given color standing on the square.
+PAWN_ATTACKS = {
+    WHITE: _leaper_table([(-1, -1), (-1, 1)]),
+    BLACK: _leaper_table([(1, -1), (1, 1)]),
+}
+ROOK_RAYS = _ray_table(ROOK_DIRECTIONS)
+BISHOP_RAYS = _ray_table(BISHOP_DIRECTIONS)
+
+KNIGHT_BITBOARDS = _bitboard_table(KNIGHT_ATTACKS)
+KING_BITBOARDS = _bitboard_table(KING_ATTACKS)
+PAWN_BITBOARDS = {color: _bitboard_table(table) for color, table in PAWN_ATTACKS.items()}
+
+
+def _between_table():
+    table = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for ray in ROOK_RAYS[square] + BISHOP_RAYS[square]:
+            between = 0
+            for target in ray:
+                table[square][target] = between
+                between |= 1 << target
+    return table
+
+
+# Squares strictly between two squares on a shared line, 0 otherwise.
+BETWEEN = _between_table()
+
+
+def occupancy(board):
+    """Returns the occupancy bitboard of the board list."""
+    occupied = 0
+    for square, piece in enumerate(board):
+        if piece != " ":
+            occupied |= 1 << square
+    return occupied
+
+
+def is_square_attacked(board, square, by_color):
+    """Checks whether any piece of `by_color` attacks the square.
+
+    Args:
+        board (list): The 64 square board.
+        square (int): The square to test.
+        by_color (str): "w" or "b".
+
+    Returns:
+        bool: True if the square is attacked.
+    """
+    pawn = by_color + "p"
+    for origin in PAWN_ATTACKS[OPPOSITE[by_color]][square]:
+        if board[origin] == pawn:
+            return True
+
+    knight = by_color + "n"
+    for origin in KNIGHT_ATTACKS[square]:
+        if board[origin] == knight:
+            return True
+
+    king = by_color + "k"
+    for origin in KING_ATTACKS[square]:
+        if board[origin] == king:
+            return True
+
+    rook, bishop, queen = by_color + "r", by_color + "b", by_color + "q"
+    for ray in ROOK_RAYS[square]:
+        for origin in ray:
+            piece = board[origin]
+            if piece != " ":
+                if piece == rook or piece == queen:
+                    return True
+                break
+    for ray in BISHOP_RAYS[square]:
+        for origin in ray:
+            piece = board[origin]
+            if piece != " ":
+                if piece == bishop or piece == queen:
+                    return True
+                break
+
+    return False
+
+
+def attackers_to(board, square, color, occupied):
+    """Collects the squares of every `color` piece attacking the square.
+
+    Pieces whose bit is cleared in `occupied` are treated as already
+    removed, which lets sliders behind them be seen as x-ray attackers.
+
+    Args:
+        board (list): The 64 square board.
+        square (int): The attacked square.
+        color (str): "w" or "b".
+        occupied (int): Occupancy bitboard.
+
+    Returns:
+        list: Attacking squares.
+    """
+    attackers = []
+
+    pawn = color + "p"
+    for origin in PAWN_ATTACKS[OPPOSITE[color]][square]:
+        if board[origin] == pawn and occupied >> origin & 1:
+            attackers.append(origin)
+
+    knight = color + "n"
+    for origin in KNIGHT_ATTACKS[square]:
+        if board[origin] == knight and occupied >> origin & 1:
+            attackers.append(origin)
+
+    king = color + "k"
+    for origin in KING_ATTACKS[square]:
+        if board[origin] == king and occupied >> origin & 1:
+            attackers.append(origin)
+
+    for rays, sliders in (
+        (ROOK_RAYS[square], (color + "r", color + "q")),
+        (BISHOP_RAYS[square], (color + "b", color + "q")),
+    ):
+        for ray in rays:
+            for origin in ray:
+                if occupied >> origin & 1:
+                    if board[origin] in sliders:
+                        attackers.append(origin)
+                    break
+
+    return attackers
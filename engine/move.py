@@ -0,0 +1,56 @@
+"""Packed 16-bit moves.
+
+    bits 0-5    from square
+    bits 6-11   to square
+    bits 12-15  flags
+
+Flags follow the usual from-to-flags layout: bit 14 marks captures and
+bit 15 promotions, with the promoted piece in the two low flag bits.
+Moves fit an unsigned short, so move lists can live in `array("H")`.
+"""
+
+QUIET = 0
+DOUBLE_PAWN_PUSH = 1
+KING_CASTLE = 2
+QUEEN_CASTLE = 3
+CAPTURE = 4
+EP_CAPTURE = 5
+PROMOTION = 8
+PROMOTION_CAPTURE = 12
+
+PROMOTION_PIECES = "nbrq"
+
+CAPTURE_BIT = 0x4000
+PROMOTION_BIT = 0x8000
+FROM_TO_MASK = 0x0FFF
+
+
+def encode_move(from_square, to_square, flags=QUIET):
+    return from_square | to_square << 6 | flags << 12
+
+
+def move_from(move):
+    return move & 63
+
+
+def move_to(move):
+    return move >> 6 & 63
+
+
+def move_flags(move):
+    return move >> 12
+
+
+def is_capture(move):
+    return bool(move & CAPTURE_BIT)
+
+
+def is_promotion(move):
+    return bool(move & PROMOTION_BIT)
+
+
+def move_promotion(move):
+    """Returns the promoted piece ("q", "r", "b", "n") or None."""
+    if move & PROMOTION_BIT:
+        return PROMOTION_PIECES[move >> 12 & 3]
+    return None
@@ -0,0 +1,238 @@
+"""UCI and SAN codecs for packed moves.
+
+Encoding is table driven: coordinate strings are looked up by the 12
+from-to bits, and SAN disambiguation finds the other candidate pieces
+through the attack tables instead of generating every move.
+"""
+
+from .attacks import OPPOSITE, PAWN_ATTACKS, WHITE, attackers_to, occupancy
+from .move import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EP_CAPTURE,
+    FROM_TO_MASK,
+    KING_CASTLE,
+    PROMOTION,
+    PROMOTION_PIECES,
+    QUEEN_CASTLE,
+    QUIET,
+    encode_move,
+    is_capture,
+    move_flags,
+    move_promotion,
+)
+from .position import CASTLING, SQUARE_NAMES
+
+
+SQUARE_INDEX = {name: square for square, name in enumerate(SQUARE_NAMES)}
+# Indexed by the from-to bits of a packed move.
+UCI_NAMES = [
+    SQUARE_NAMES[from_square] + SQUARE_NAMES[to_square]
+    for to_square in range(64)
+    for from_square in range(64)
+]
+UCI_KEYS = {name: key for key, name in enumerate(UCI_NAMES)}
+SAN_PIECES = {"N": "n", "B": "b", "R": "r", "Q": "q", "K": "k"}
+CASTLING_SAN = {KING_CASTLE: "O-O", QUEEN_CASTLE: "O-O-O"}
+
+
+def move_to_uci(move):
+    """Formats a packed move in UCI notation, e.g. "e2e4" or "e7e8q"."""
+    promotion = move_promotion(move)
+    if promotion:
+        return UCI_NAMES[move & FROM_TO_MASK] + promotion
+    return UCI_NAMES[move & FROM_TO_MASK]
+
+
+def move_from_uci(position, text):
+    """Parses a UCI move for the position.
+
+    Args:
+        position (Position): The position the move is played in.
+        text (str): The move, e.g. "e2e4".
+
+    Returns:
+        int: The packed move.
+
+    Raises:
+        ValueError: If the text is malformed or the move is illegal.
+    """
+    key = UCI_KEYS.get(text[:4])
+    promotion = text[4:] or None
+    if key is None or (promotion and promotion not in PROMOTION_PIECES):
+        raise ValueError(f"Invalid UCI move: {text}")
+
+    for move in position.generate_moves():
+        if (
+            move & FROM_TO_MASK == key
+            and move_promotion(move) == promotion
+            and position.is_legal(move)
+        ):
+            return move
+
+    raise ValueError(f"Illegal move: {text}")
+
+
+def _piece_flags(position, to_square):
+    return CAPTURE if position.board[to_square][0] == OPPOSITE[position.side] else QUIET
+
+
+def _candidates(position, kind, to_square):
+    """Finds pseudo-legal moves of `kind` pieces to the square.
+
+    Pawn captures and pushes are traced backwards from the target square;
+    other pieces are found with `attackers_to`.
+    """
+    board = position.board
+    side = position.side
+    target = board[to_square]
+    if target[0] == side:
+        return []
+
+    candidates = []
+    if kind != "p":
+        for from_square in attackers_to(board, to_square, side, occupancy(board)):
+            if board[from_square][1] == kind:
+                candidates.append(
+                    encode_move(from_square, to_square, _piece_flags(position, to_square))
+                )
+        return candidates
+
+    pawn = side + "p"
+    promotes = to_square < 8 or to_square >= 56
+    if target != " " or to_square == position.ep_square:
+        flags = CAPTURE if target != " " else EP_CAPTURE
+        for from_square in PAWN_ATTACKS[OPPOSITE[side]][to_square]:
+            if board[from_square] == pawn:
+                candidates.append(encode_move(from_square, to_square, flags))
+    else:
+        step = 8 if side == WHITE else -8
+        from_square = to_square + step
+        if 0 <= from_square < 64 and board[from_square] == pawn:
+            candidates.append(encode_move(from_square, to_square))
+        elif 0 <= from_square < 64 and board[from_square] == " ":
+            double_from = from_square + step
+            start_row = 6 if side == WHITE else 1
+            if double_from // 8 == start_row and board[double_from] == pawn:
+                candidates.append(encode_move(double_from, to_square, DOUBLE_PAWN_PUSH))
+
+    if promotes:
+        candidates = [
+            move | (PROMOTION | piece_index) << 12
+            for move in candidates
+            for piece_index in (3, 2, 1, 0)
+        ]
+    return candidates
+
+
+def _check_suffix(position, move):
+    position.make_move(move)
+    suffix = ""
+    if position.in_check():
+        suffix = "+" if position.has_legal_move() else "#"
+    position.unmake_move()
+    return suffix
+
+
+def move_to_san(position, move):
+    """Formats a legal packed move in SAN, e.g. "Nf3", "exd5", "O-O", "e8=Q+".
+
+    Args:
+        position (Position): The position before the move.
+        move (int): The packed move.
+
+    Returns:
+        str: The move in standard algebraic notation.
+    """
+    flags = move_flags(move)
+    if flags in CASTLING_SAN:
+        return CASTLING_SAN[flags] + _check_suffix(position, move)
+
+    from_square, to_square = move & 63, move >> 6 & 63
+    kind = position.board[from_square][1]
+    from_name = SQUARE_NAMES[from_square]
+    capture = "x" if is_capture(move) else ""
+
+    if kind == "p":
+        san = (from_name[0] + capture if capture else "") + SQUARE_NAMES[to_square]
+        promotion = move_promotion(move)
+        if promotion:
+            san += "=" + promotion.upper()
+        return san + _check_suffix(position, move)
+
+    others = [
+        SQUARE_NAMES[other & 63]
+        for other in _candidates(position, kind, to_square)
+        if other & 63 != from_square and position.is_legal(other)
+    ]
+    if not others:
+        hint = ""
+    elif all(name[0] != from_name[0] for name in others):
+        hint = from_name[0]
+    elif all(name[1] != from_name[1] for name in others):
+        hint = from_name[1]
+    else:
+        hint = from_name
+
+    san = kind.upper() + hint + capture + SQUARE_NAMES[to_square]
+    return san + _check_suffix(position, move)
+
+
+def _matches_hint(from_name, hint):
+    return all(
+        from_name[0 if char.isalpha() else 1] == char for char in hint
+    )
+
+
+def move_from_san(position, text):
+    """Parses a SAN move for the position.
+
+    Args:
+        position (Position): The position the move is played in.
+        text (str): The move, e.g. "Nbd7", "exd5", "O-O-O", "e8=Q+".
+
+    Returns:
+        int: The packed move.
+
+    Raises:
+        ValueError: If the text is malformed, illegal or ambiguous.
+    """
+    san = text.rstrip("+#!?")
+
+    if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        flags = KING_CASTLE if len(san) == 3 else QUEEN_CASTLE
+        for right in position.castling:
+            king_from, king_to, *_, right_flags = CASTLING[right]
+            if right_flags == flags and (right.isupper()) == (position.side == WHITE):
+                move = encode_move(king_from, king_to, flags)
+                if move in position.generate_moves() and position.is_legal(move):
+                    return move
+        raise ValueError(f"Illegal move: {text}")
+
+    promotion = None
+    if "=" in san:
+        san, promotion = san.split("=", 1)
+        promotion = promotion.lower()
+    elif san and san[-1] in "QRBN" and san[0].islower():
+        san, promotion = san[:-1], san[-1].lower()
+
+    kind = SAN_PIECES.get(san[:1], "p")
+    body = san[1:] if kind != "p" else san
+    body = body.replace("x", "")
+    to_square = SQUARE_INDEX.get(body[-2:])
+    hint = body[:-2]
+    if to_square is None or len(hint) > 2 or (promotion and promotion not in PROMOTION_PIECES):
+        raise ValueError(f"Invalid SAN move: {text}")
+
+    matches = [
+        move
+        for move in _candidates(position, kind, to_square)
+        if move_promotion(move) == promotion
+        and _matches_hint(SQUARE_NAMES[move & 63], hint)
+        and position.is_legal(move)
+    ]
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise ValueError(f"Ambiguous move: {text}")
+    raise ValueError(f"Illegal move: {text}")
@@ -0,0 +1,455 @@
+from array import array
+
+from highlight_moves import GenerateAlgebraicNotation
+from .attacks import (
+    BLACK,
+    WHITE,
+    OPPOSITE,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    ROOK_RAYS,
+    BISHOP_RAYS,
+    is_square_attacked,
+)
+from .attack_state import AttackState
+from .repetition import FIFTY_MOVE_PLIES, RepetitionHistory
+from .move import (
+    CAPTURE,
+    DOUBLE_PAWN_PUSH,
+    EP_CAPTURE,
+    KING_CASTLE,
+    PROMOTION,
+    PROMOTION_PIECES,
+    QUEEN_CASTLE,
+    QUIET,
+    encode_move,
+)
+from .zobrist import (
+    CASTLING_KEYS,
+    EP_FILE_KEYS,
+    PIECE_KEYS,
+    SIDE_KEY,
+    compute_hash,
+    ep_capture_possible,
+)
+
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+SQUARE_NAMES = GenerateAlgebraicNotation().square_algebraic_notation
+
+# king from, king to, rook from, rook to, squares that must be empty,
+# squares the king must not be attacked on, move flag
+CASTLING = {
+    "K": (60, 62, 63, 61, (61, 62), (60, 61, 62), KING_CASTLE),
+    "Q": (60, 58, 56, 59, (57, 58, 59), (60, 59, 58), QUEEN_CASTLE),
+    "k": (4, 6, 7, 5, (5, 6), (4, 5, 6), KING_CASTLE),
+    "q": (4, 2, 0, 3, (1, 2, 3), (4, 3, 2), QUEEN_CASTLE),
+}
+# king destination -> (rook from, rook to)
+CASTLING_ROOKS = {
+    king_to: (rook_from, rook_to)
+    for _, king_to, rook_from, rook_to, *_ in CASTLING.values()
+}
+# Castling rights lost when a piece leaves or lands on the square.
+CASTLING_LOST = {60: "KQ", 63: "K", 56: "Q", 4: "kq", 7: "k", 0: "q"}
+
+
+class Position:
+    """
+    Represents a Chess Position for the engine.
+
+    Attributes:
+        board (list): 64 squares holding "wp", "bk", ... or " " (a8 first).
+        side (str): The side to move, "w" or "b".
+        castling (str): Remaining castling rights in FEN order.
+        ep_square (int): The en passant target square, or None.
+        halfmove_clock (int): Plies since the last capture or pawn move.
+        fullmove_number (int): The FEN fullmove counter.
+        hash (int): Zobrist key, updated incrementally by make/unmake.
+        attack_state (AttackState): Attacks, checkers and pins for the side
+            to move, computed on first use and restored by unmake.
+        repetitions (RepetitionHistory): Hashes of the positions played,
+            kept in step by make/unmake.
+    """
+
+    def __init__(
+        self, board, side=WHITE, castling="KQkq", ep_square=None,
+        halfmove_clock=0, fullmove_number=1,
+    ) -> None:
+        self.board = list(board)
+        self.side = side
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.hash = compute_hash(self.board, side, castling, ep_square)
+        self.repetitions = RepetitionHistory(self.hash)
+        self._attack_state = None
+        self._undo_stack = []
+
+    @classmethod
+    def from_fen(cls, fen=START_FEN):
+        """Creates a position from a FEN string.
+
+        Raises:
+            ValueError: If the FEN is malformed or a side doesn't have
+                exactly one king.
+        """
+        fields = fen.split()
+        if len(fields) < 2 or fields[1] not in (WHITE, BLACK):
+            raise ValueError(f"invalid FEN {fen!r}: expected placement and side to move")
+        placement, side = fields[0], fields[1]
+        castling = fields[2] if len(fields) > 2 else "-"
+        ep = fields[3] if len(fields) > 3 else "-"
+        halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+
+        board = []
+        for rank in placement.split("/"):
+            squares = len(board)
+            for char in rank:
+                if char in "12345678":
+                    board.extend(" " * int(char))
+                elif char.lower() in "pnbrqk":
+                    color = WHITE if char.isupper() else BLACK
+                    board.append(color + char.lower())
+                else:
+                    raise ValueError(f"invalid FEN {fen!r}: unknown piece {char!r}")
+            if len(board) - squares != 8:
+                raise ValueError(f"invalid FEN {fen!r}: rank {rank!r} isn't 8 squares")
+        if len(board) != 64:
+            raise ValueError(f"invalid FEN {fen!r}: expected 8 ranks")
+        if board.count(WHITE + "k") != 1 or board.count(BLACK + "k") != 1:
+            raise ValueError(f"invalid FEN {fen!r}: each side needs exactly one king")
+
+        if castling != "-" and (
+            set(castling) - set(CASTLING) or len(set(castling)) != len(castling)
+        ):
+            raise ValueError(f"invalid FEN {fen!r}: bad castling rights {castling!r}")
+        if ep != "-" and ep not in SQUARE_NAMES:
+            raise ValueError(f"invalid FEN {fen!r}: bad en passant square {ep!r}")
+
+        return cls(
+            board,
+            side,
+            "".join(right for right in CASTLING if right in castling),
+            None if ep == "-" else SQUARE_NAMES.index(ep),
+            halfmove_clock,
+            fullmove_number,
+        )
+
+    @classmethod
+    def from_game(cls, game, side=WHITE):
+        """Creates a position from the `PlacePiece` board list.
+
+        The per-piece suffixes ("wp5", "bn1") are dropped and castling rights
+        are inferred from kings and rooks still standing on their home squares.
+        """
+        board = [piece[:2] if piece != " " else " " for piece in game]
+        castling = "".join(
+            right
+            for right, (king_from, _, rook_from, *_) in CASTLING.items()
+            if board[king_from] == ("w" if right.isupper() else "b") + "k"
+            and board[rook_from] == ("w" if right.isupper() else "b") + "r"
+        )
+        return cls(board, side, castling)
+
+    def to_fen(self):
+        """Returns the position as a FEN string."""
+        rows = []
+        for row in range(8):
+            empty = 0
+            text = ""
+            for piece in self.board[row * 8:row * 8 + 8]:
+                if piece == " ":
+                    empty += 1
+                    continue
+                if empty:
+                    text += str(empty)
+                    empty = 0
+                text += piece[1].upper() if piece[0] == WHITE else piece[1]
+            if empty:
+                text += str(empty)
+            rows.append(text)
+
+        ep = SQUARE_NAMES[self.ep_square] if self.ep_square is not None else "-"
+        return (
+            f"{'/'.join(rows)} {self.side} {self.castling or '-'} {ep} "
+            f"{self.halfmove_clock} {self.fullmove_number}"
+        )
+
+    @property
+    def history_length(self):
+        """Number of moves that can currently be taken back."""
+        return len(self._undo_stack)
+
+    def copy(self):
+        """Returns an independent copy without the undo history.
+
+        The repetition history is kept, so a search of the copy still sees
+        repetitions of positions played before it.
+        """
+        position = Position(
+            self.board, self.side, self.castling, self.ep_square,
+            self.halfmove_clock, self.fullmove_number,
+        )
+        position.repetitions = self.repetitions.copy()
+        return position
+
+    def is_repetition(self, times=1):
+        """Checks whether the position occurred at least `times` times before."""
+        return self.repetitions.count(self.hash, self.halfmove_clock) >= times
+
+    def is_fifty_move_draw(self):
+        return self.halfmove_clock >= FIFTY_MOVE_PLIES
+
+    @property
+    def attack_state(self):
+        if self._attack_state is None:
+            self._attack_state = AttackState(self)
+        return self._attack_state
+
+    def king_square(self, color):
+        return self.board.index(color + "k")
+
+    def in_check(self, color=None):
+        """Checks whether the king of `color` (default: side to move) is attacked."""
+        color = color or self.side
+        if color == self.side and self._attack_state is not None:
+            return self._attack_state.in_check
+        return is_square_attacked(self.board, self.king_square(color), OPPOSITE[color])
+
+    def captured_piece(self, move):
+        """Returns the piece removed by the move, or " " for quiet moves."""
+        flags = move >> 12
+        if flags == EP_CAPTURE:
+            return OPPOSITE[self.side] + "p"
+        if flags & CAPTURE:
+            return self.board[move >> 6 & 63]
+        return " "
+
+    def _add_pawn_moves(self, moves, from_square, to_square, flags):
+        if to_square < 8 or to_square >= 56:
+            base = PROMOTION | flags
+            for piece_index in (3, 2, 1, 0):
+                moves.append(encode_move(from_square, to_square, base | piece_index))
+        else:
+            moves.append(encode_move(from_square, to_square, flags))
+
+    def generate_moves(self, captures_only=False):
+        """Generates pseudo-legal moves as packed 16-bit moves.
+
+        Args:
+            captures_only (bool): Only captures and promotions.
+
+        Returns:
+            array: The generated moves, typecode "H".
+        """
+        board = self.board
+        side = self.side
+        enemy = OPPOSITE[side]
+        moves = array("H")
+        append = moves.append
+
+        for square, piece in enumerate(board):
+            if piece[0] != side:
+                continue
+            kind = piece[1]
+
+            if kind == "p":
+                for target in PAWN_ATTACKS[side][square]:
+                    if board[target][0] == enemy:
+                        self._add_pawn_moves(moves, square, target, CAPTURE)
+                    elif target == self.ep_square:
+                        append(encode_move(square, target, EP_CAPTURE))
+
+                step = -8 if side == WHITE else 8
+                target = square + step
+                if board[target] == " ":
+                    if target < 8 or target >= 56:
+                        self._add_pawn_moves(moves, square, target, QUIET)
+                    elif not captures_only:
+                        append(encode_move(square, target))
+                        start_row = 6 if side == WHITE else 1
+                        if square // 8 == start_row and board[target + step] == " ":
+                            append(encode_move(square, target + step, DOUBLE_PAWN_PUSH))
+                continue
+
+            if kind == "n" or kind == "k":
+                table = KNIGHT_ATTACKS if kind == "n" else KING_ATTACKS
+                for target in table[square]:
+                    occupant = board[target][0]
+                    if occupant == enemy:
+                        append(encode_move(square, target, CAPTURE))
+                    elif occupant == " " and not captures_only:
+                        append(encode_move(square, target))
+                continue
+
+            rays = ()
+            if kind == "r" or kind == "q":
+                rays += ROOK_RAYS[square]
+            if kind == "b" or kind == "q":
+                rays += BISHOP_RAYS[square]
+            for ray in rays:
+                for target in ray:
+                    occupant = board[target][0]
+                    if occupant == " ":
+                        if not captures_only:
+                            append(encode_move(square, target))
+                        continue
+                    if occupant == enemy:
+                        append(encode_move(square, target, CAPTURE))
+                    break
+
+        if not captures_only:
+            self._add_castling_moves(moves)
+
+        return moves
+
+    def _add_castling_moves(self, moves):
+        if not self.castling:
+            return
+        enemy_attacks = self.attack_state.attacks_by(OPPOSITE[self.side])
+        for right in self.castling:
+            if (right.isupper()) != (self.side == WHITE):
+                continue
+            king_from, king_to, rook_from, _, empty, safe, flags = CASTLING[right]
+            if self.board[king_from] != self.side + "k":
+                continue
+            if self.board[rook_from] != self.side + "r":
+                continue
+            if any(self.board[square] != " " for square in empty):
+                continue
+            if any(enemy_attacks >> square & 1 for square in safe):
+                continue
+            moves.append(encode_move(king_from, king_to, flags))
+
+    def is_legal(self, move):
+        """Checks that a pseudo-legal move does not leave the mover in check.
+
+        Reads the attack state instead of playing the move; only en passant,
+        which can uncover a check along the rank, is played out.
+        """
+        state = self.attack_state
+        from_square = move & 63
+        to_square = move >> 6 & 63
+
+        if from_square == state.king_square:
+            flags = move >> 12
+            if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+                return True
+            return not state.attacks_by(OPPOSITE[self.side]) >> to_square & 1
+
+        if not state.check_mask >> to_square & 1:
+            if move >> 12 != EP_CAPTURE or not state.checkers:
+                return False
+        if state.pinned >> from_square & 1 and not state.pin_rays[from_square] >> to_square & 1:
+            return False
+
+        if move >> 12 == EP_CAPTURE:
+            side = self.side
+            self.make_move(move)
+            legal = not self.in_check(side)
+            self.unmake_move()
+            return legal
+        return True
+
+    def legal_moves(self, captures_only=False):
+        """Generates moves that do not leave the mover's king in check."""
+        return array(
+            "H", [move for move in self.generate_moves(captures_only) if self.is_legal(move)]
+        )
+
+    def has_legal_move(self):
+        return any(self.is_legal(move) for move in self.generate_moves())
+
+    def make_move(self, move):
+        """Plays a move on the board, keeping enough state to undo it."""
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        flags = move >> 12
+        board = self.board
+        piece = board[from_square]
+        capture_square = to_square
+        if flags == EP_CAPTURE:
+            capture_square = to_square + (8 if self.side == WHITE else -8)
+        captured = board[capture_square]
+
+        self._undo_stack.append(
+            (move, piece, captured, capture_square, self.castling,
+             self.ep_square, self.halfmove_clock, self.hash, self._attack_state)
+        )
+        self._attack_state = None
+
+        key = self.hash ^ SIDE_KEY ^ PIECE_KEYS[piece][from_square]
+        if captured != " ":
+            key ^= PIECE_KEYS[captured][capture_square]
+        if ep_capture_possible(board, self.side, self.ep_square):
+            key ^= EP_FILE_KEYS[self.ep_square % 8]
+
+        board[capture_square] = " "
+        board[to_square] = piece
+        board[from_square] = " "
+        ep_square = None
+
+        if flags & PROMOTION:
+            board[to_square] = self.side + PROMOTION_PIECES[flags & 3]
+        elif flags == DOUBLE_PAWN_PUSH:
+            ep_square = (from_square + to_square) // 2
+            if ep_capture_possible(board, OPPOSITE[self.side], ep_square):
+                key ^= EP_FILE_KEYS[ep_square % 8]
+        elif flags == KING_CASTLE or flags == QUEEN_CASTLE:
+            rook_from, rook_to = CASTLING_ROOKS[to_square]
+            rook = board[rook_from]
+            board[rook_to] = rook
+            board[rook_from] = " "
+            key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+        key ^= PIECE_KEYS[board[to_square]][to_square]
+
+        if self.castling:
+            lost = CASTLING_LOST.get(from_square, "") + CASTLING_LOST.get(to_square, "")
+            if lost:
+                castling = "".join(r for r in self.castling if r not in lost)
+                key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+                self.castling = castling
+
+        if piece[1] == "p" or captured != " ":
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        if self.side == BLACK:
+            self.fullmove_number += 1
+        self.ep_square = ep_square
+        self.side = OPPOSITE[self.side]
+        self.hash = key
+        self.repetitions.push(key)
+
+    def unmake_move(self):
+        """Takes back the last move played with `make_move`."""
+        (move, piece, captured, capture_square, castling,
+         ep_square, halfmove_clock, key, attack_state) = self._undo_stack.pop()
+        from_square = move & 63
+        to_square = move >> 6 & 63
+        flags = move >> 12
+        board = self.board
+
+        self.side = OPPOSITE[self.side]
+        if self.side == BLACK:
+            self.fullmove_number -= 1
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.hash = key
+        self._attack_state = attack_state
+        self.repetitions.pop()
+
+        board[from_square] = piece
+        board[to_square] = " "
+        board[capture_square] = captured
+
+        if flags == KING_CASTLE or flags == QUEEN_CASTLE:
+            rook_from, rook_to = CASTLING_ROOKS[to_square]
+            board[rook_from] = board[rook_to]
+            board[rook_to] = " "
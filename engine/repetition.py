@@ -0,0 +1,61 @@
+from array import array
+
+
+# Plies without a capture or pawn move after which the game is drawn.
+FIFTY_MOVE_PLIES = 100
+# Power of two above FIFTY_MOVE_PLIES: every position that can still repeat
+# fits in the buffer.
+RING_SIZE = 128
+
+
+class RepetitionHistory:
+    """
+    Represents a Ring Buffer of the position hashes of a game.
+
+    Only positions since the last capture or pawn move can repeat, and the
+    halfmove clock says how many those are, so a repetition check looks at
+    no more than that many entries; older ones are simply overwritten.
+
+    Attributes:
+        ply (int): Index of the current position since the buffer started.
+    """
+
+    def __init__(self, position_hash) -> None:
+        self.ply = 0
+        self._hashes = array("Q", [0]) * RING_SIZE
+        self._hashes[0] = position_hash
+
+    def copy(self):
+        history = RepetitionHistory.__new__(RepetitionHistory)
+        history.ply = self.ply
+        history._hashes = array("Q", self._hashes)
+        return history
+
+    def push(self, position_hash):
+        """Records the position reached by a move."""
+        self.ply += 1
+        self._hashes[self.ply % RING_SIZE] = position_hash
+
+    def pop(self):
+        """Forgets the last position, when its move is taken back."""
+        self.ply -= 1
+
+    def count(self, position_hash, halfmove_clock):
+        """Counts the earlier occurrences of the current position.
+
+        Args:
+            position_hash (int): Hash of the current position.
+            halfmove_clock (int): Plies since the last capture or pawn move.
+
+        Returns:
+            int: How often the position occurred before; 2 means threefold.
+        """
+        reach = min(halfmove_clock, self.ply, RING_SIZE - 1)
+        hashes = self._hashes
+        ply = self.ply
+        # The same side must be to move, and leaving a position and coming
+        # back takes at least two moves each.
+        return sum(
+            1 for back in range(4, reach + 1, 2)
+            if hashes[(ply - back) % RING_SIZE] == position_hash
+        )
@@ -0,0 +1,382 @@
+import time
+
+from .evaluate import PIECE_VALUES, evaluate
+from .move import CAPTURE_BIT, FROM_TO_MASK, PROMOTION_BIT, move_promotion
+from .see import static_exchange_evaluation
+from .transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+
+MATE_SCORE = 100000
+MAX_PLY = 64
+# Largest positional swing a single capture is assumed to add on top of
+# the captured material; anything that can't reach alpha with it is skipped.
+DELTA_MARGIN = 200
+# History scores are halved once one reaches this, keeping quiet moves
+# ordered below every capture and letting old cutoffs fade.
+HISTORY_LIMIT = 16384
+
+
+class SearchAborted(Exception):
+    """Raised inside the search once it is stopped or its budget is spent."""
+
+
+class SearchStats:
+    """
+    Node counters for a single search.
+
+    Attributes:
+        nodes (int): Nodes visited by the main alpha-beta search.
+        qnodes (int): Nodes visited by the quiescence search.
+        see_pruned (int): Captures skipped because SEE found them losing.
+        delta_pruned (int): Captures skipped by delta pruning.
+    """
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.qnodes = 0
+        self.see_pruned = 0
+        self.delta_pruned = 0
+
+    @property
+    def total_nodes(self):
+        return self.nodes + self.qnodes
+
+    def summary(self):
+        """Returns a one-line report of where the nodes were spent."""
+        share = 100 * self.qnodes / self.total_nodes if self.total_nodes else 0.0
+        return (
+            f"nodes {self.total_nodes} (main {self.nodes}, quiescence {self.qnodes}, "
+            f"{share:.1f}%) see-pruned {self.see_pruned} delta-pruned {self.delta_pruned}"
+        )
+
+
+def _score_to_table(score, ply):
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score + ply
+    return score
+
+
+class Search:
+    """
+    Represents an alpha-beta search.
+
+    Attributes:
+        position (Position): The position being searched; restored afterwards.
+        quiescence (bool): Whether leaves are resolved with a capture search.
+        transposition_table (TranspositionTable): Shared between searches.
+        history (list): Quiet-move cutoff scores indexed by from/to squares;
+            may be shared between searches like the transposition table.
+        stats (SearchStats): Node counters of the last search.
+        completed_depth (int): Deepest iteration finished by the last `go`.
+        pv (list): Principal variation of the deepest completed iteration.
+        lines (list): (score, pv) of the best root moves, best first; holds
+            `multi_pv` lines when there are enough legal moves.
+        stop_requested (bool): Set from another thread to stop the search.
+    """
+
+    def __init__(
+        self, position, quiescence=True, transposition_table=None, history=None
+    ) -> None:
+        self.position = position
+        self.quiescence = quiescence
+        self.transposition_table = transposition_table or TranspositionTable()
+        self.history = history if history is not None else [0] * (FROM_TO_MASK + 1)
+        self.stats = SearchStats()
+        self.completed_depth = 0
+        self.pv = []
+        self.lines = []
+        self.stop_requested = False
+        self._node_budget = float("inf")
+        self._deadline = float("inf")
+        self._pv_table = [[] for _ in range(MAX_PLY + 2)]
+
+    def stop(self):
+        """Asks a running search to return; safe to call from another thread."""
+        self.stop_requested = True
+
+    def set_time_limit(self, movetime):
+        """Sets the time budget, in milliseconds from now; None removes it."""
+        self._deadline = (
+            time.perf_counter() + movetime / 1000 if movetime else float("inf")
+        )
+
+    def _check_budget(self):
+        total = self.stats.total_nodes
+        if self.stop_requested or total >= self._node_budget:
+            raise SearchAborted
+        if not total & 255 and time.perf_counter() >= self._deadline:
+            raise SearchAborted
+
+    def _order_moves(self, moves, first_move=None):
+        board = self.position.board
+        history = self.history
+
+        def score(move):
+            if move == first_move:
+                return 2 * PIECE_VALUES["k"]
+            if move & CAPTURE_BIT:
+                victim = self.position.captured_piece(move)[1]
+                return 10 * PIECE_VALUES[victim] - PIECE_VALUES[board[move & 63][1]]
+            if move & PROMOTION_BIT:
+                return PIECE_VALUES[move_promotion(move)]
+            return history[move & FROM_TO_MASK] - 2 * PIECE_VALUES["k"]
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _update_history(self, move, depth):
+        history = self.history
+        index = move & FROM_TO_MASK
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            history[:] = [value // 2 for value in history]
+
+    def search(self, depth):
+        """Searches the position to the given depth.
+
+        Args:
+            depth (int): Depth in plies.
+
+        Returns:
+            tuple: (score, best_move); best_move is None without legal moves.
+        """
+        self.stats = SearchStats()
+        self._node_budget = self._deadline = float("inf")
+        self.transposition_table.new_search()
+        self.lines = []
+        score, best_move = self._search_root(depth)
+        self.completed_depth = depth
+        self.pv = self._principal_variation(best_move)
+        return score, best_move
+
+    def go(self, depth=MAX_PLY, nodes=None, movetime=None, info=None, multi_pv=1):
+        """Searches with iterative deepening until a depth or budget is reached.
+
+        Args:
+            depth (int): Maximum depth in plies.
+            nodes (int): Node budget, counting main and quiescence nodes.
+            movetime (int): Time budget in milliseconds.
+            info (callable): Called with (depth, score, elapsed seconds) after
+                every completed iteration; `stats`, `pv` and `lines` are up
+                to date.
+            multi_pv (int): Number of best root moves given exact scores.
+
+        Returns:
+            tuple: (score, best_move) of the deepest completed iteration.
+        """
+        self.stats = SearchStats()
+        self.completed_depth = 0
+        self.pv = []
+        self.lines = []
+        self._node_budget = nodes or float("inf")
+        self.set_time_limit(movetime)
+        self.transposition_table.new_search()
+        start = time.perf_counter()
+
+        position = self.position
+        root_length = position.history_length
+        score, best_move = 0, None
+
+        for current_depth in range(1, min(depth, MAX_PLY) + 1):
+            try:
+                score, best_move = self._search_root(current_depth, best_move, multi_pv)
+            except SearchAborted:
+                while position.history_length > root_length:
+                    position.unmake_move()
+                break
+            self.completed_depth = current_depth
+            self.pv = self._principal_variation(best_move)
+            if self.lines:
+                self.lines[0] = (score, self.pv)
+            if info is not None:
+                info(current_depth, score, time.perf_counter() - start)
+            if best_move is None or (multi_pv == 1 and abs(score) >= MATE_SCORE - MAX_PLY):
+                break
+
+        if best_move is None and self.completed_depth == 0:
+            moves = position.legal_moves()
+            best_move = self._order_moves(moves)[0] if moves else None
+            self.pv = [best_move] if best_move is not None else []
+            self.lines = [(score, self.pv)] if best_move is not None else []
+
+        return score, best_move
+
+    def _principal_variation(self, best_move):
+        if best_move is None:
+            return []
+
+        # Transposition table cutoffs cut the collected line short, so it is
+        # extended with stored best moves up to the completed depth.
+        pv = list(self._pv_table[0])
+        position = self.position
+        for move in pv:
+            position.make_move(move)
+        while len(pv) < self.completed_depth:
+            entry = self.transposition_table.probe(position.hash)
+            if entry is None or entry[4] is None or entry[4] not in position.legal_moves():
+                break
+            pv.append(entry[4])
+            position.make_move(entry[4])
+        for _ in pv:
+            position.unmake_move()
+        return pv
+
+    def _search_root(self, depth, first_move=None, multi_pv=1):
+        self.stats.nodes += 1
+        self._pv_table[0] = []
+        position = self.position
+
+        # The previous iteration's lines are searched first, in order.
+        moves = self._order_moves(position.legal_moves(), first_move)
+        previous = [pv[0] for _, pv in self.lines if pv]
+        moves.sort(key=lambda move: previous.index(move) if move in previous else len(previous))
+
+        # A move only needs an exact score if it beats the worst of the
+        # `multi_pv` best lines found so far; with one line this is plain
+        # alpha-beta at the root.
+        lines = []
+        beta = MATE_SCORE + 1
+        for move in moves:
+            alpha = lines[-1][0] if len(lines) == multi_pv else -MATE_SCORE - 1
+            position.make_move(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, 1)
+            position.unmake_move()
+            if score > alpha:
+                lines.append((score, [move] + self._pv_table[1]))
+                lines.sort(key=lambda line: line[0], reverse=True)
+                del lines[multi_pv:]
+
+        if not lines:
+            self.lines = []
+            return (-MATE_SCORE if position.in_check() else 0), None
+        self.lines = lines
+        score, self._pv_table[0] = lines[0]
+        best_move = self._pv_table[0][0]
+        self.transposition_table.store(position.hash, depth, score, EXACT, best_move)
+        return score, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        self._pv_table[ply] = []
+        position = self.position
+        # Repeating any earlier position, in the tree or in the game, is
+        # scored as the draw it can be turned into.
+        if position.is_fifty_move_draw() or position.is_repetition():
+            return 0
+        if depth <= 0:
+            if self.quiescence:
+                return self._quiescence(alpha, beta, ply)
+            return evaluate(self.position)
+
+        self.stats.nodes += 1
+        self._check_budget()
+
+        table_move = None
+        entry = self.transposition_table.probe(position.hash)
+        if entry is not None:
+            _, entry_depth, entry_score, bound, table_move, _ = entry
+            if entry_depth >= depth:
+                entry_score = _score_from_table(entry_score, ply)
+                if (
+                    bound == EXACT
+                    or (bound == LOWER_BOUND and entry_score >= beta)
+                    or (bound == UPPER_BOUND and entry_score <= alpha)
+                ):
+                    return entry_score
+
+        moves = position.legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if position.in_check() else 0
+        if ply >= MAX_PLY:
+            return evaluate(position)
+
+        original_alpha = alpha
+        best_move = None
+        for move in self._order_moves(moves, table_move):
+            position.make_move(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score >= beta:
+                if not move & (CAPTURE_BIT | PROMOTION_BIT):
+                    self._update_history(move, depth)
+                self.transposition_table.store(
+                    position.hash, depth, _score_to_table(beta, ply), LOWER_BOUND, move
+                )
+                return beta
+            if score > alpha:
+                alpha, best_move = score, move
+                self._pv_table[ply] = [move] + self._pv_table[ply + 1]
+
+        bound = EXACT if alpha > original_alpha else UPPER_BOUND
+        self.transposition_table.store(
+            position.hash, depth, _score_to_table(alpha, ply), bound, best_move
+        )
+        return alpha
+
+    def _quiescence(self, alpha, beta, ply):
+        """Searches captures only until the position is quiet.
+
+        The static evaluation acts as a stand-pat lower bound. Captures that
+        can't lift the score to alpha even with `DELTA_MARGIN` to spare, or
+        that lose material by SEE, are skipped without being played.
+        """
+        self.stats.qnodes += 1
+        self._check_budget()
+        position = self.position
+
+        if position.in_check():
+            moves = position.legal_moves()
+            if not moves:
+                return -MATE_SCORE + ply
+            if ply >= MAX_PLY:
+                return evaluate(position)
+            for move in self._order_moves(moves):
+                position.make_move(move)
+                score = -self._quiescence(-beta, -alpha, ply + 1)
+                position.unmake_move()
+                if score >= beta:
+                    return beta
+                if score > alpha:
+                    alpha = score
+            return alpha
+
+        stand_pat = evaluate(position)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat + PIECE_VALUES["q"] + DELTA_MARGIN < alpha:
+            self.stats.delta_pruned += 1
+            return alpha
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        # Pseudo-legal captures: pruned moves are never played, so legality is
+        # only checked for the ones that survive.
+        for move in self._order_moves(position.generate_moves(captures_only=True)):
+            if not move & PROMOTION_BIT:
+                victim = PIECE_VALUES[position.captured_piece(move)[1]]
+                if stand_pat + victim + DELTA_MARGIN < alpha:
+                    self.stats.delta_pruned += 1
+                    continue
+                if static_exchange_evaluation(position, move) < 0:
+                    self.stats.see_pruned += 1
+                    continue
+
+            if not position.is_legal(move):
+                continue
+            position.make_move(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score >= beta:
+                return beta
+            if score > alpha:
+                alpha = score
+
+        return alpha
@@ -0,0 +1,61 @@
+from .attacks import WHITE, OPPOSITE, attackers_to, occupancy
+from .evaluate import PIECE_VALUES
+from .move import EP_CAPTURE, is_capture, move_promotion
+
+
+def _least_valuable(board, attackers):
+    return min(attackers, key=lambda square: PIECE_VALUES[board[square][1]])
+
+
+def static_exchange_evaluation(position, move):
+    """Works out the material outcome of a capture sequence on one square.
+
+    Both sides keep recapturing with their least valuable attacker; sliders
+    uncovered behind a capturing piece join in as x-ray attackers. No move
+    is played on the board and pins are ignored.
+
+    Args:
+        position (Position): The position before the move.
+        move (int): The packed capture to evaluate.
+
+    Returns:
+        int: Expected material gain in centipawns for the side to move.
+    """
+    board = position.board
+    from_square, to_square = move & 63, move >> 6 & 63
+    promotion = move_promotion(move)
+
+    occupied = occupancy(board)
+
+    gain = [PIECE_VALUES[position.captured_piece(move)[1]] if is_capture(move) else 0]
+    attacker_value = PIECE_VALUES[promotion or board[from_square][1]]
+    if promotion:
+        gain[0] += PIECE_VALUES[promotion] - PIECE_VALUES["p"]
+
+    occupied &= ~(1 << from_square)
+    if move >> 12 == EP_CAPTURE:
+        occupied &= ~(1 << (to_square + (8 if position.side == WHITE else -8)))
+
+    # Each entry is the running balance if the opponent of the last capturer
+    # recaptures; the final, speculative entry never happens and is dropped.
+    color = OPPOSITE[position.side]
+    while True:
+        gain.append(attacker_value - gain[-1])
+        if max(-gain[-2], gain[-1]) < 0:
+            break
+
+        attackers = attackers_to(board, to_square, color, occupied)
+        if not attackers:
+            break
+
+        square = _least_valuable(board, attackers)
+        attacker_value = PIECE_VALUES[board[square][1]]
+        occupied &= ~(1 << square)
+        color = OPPOSITE[color]
+
+    gain.pop()
+    while len(gain) > 1:
+        last = gain.pop()
+        gain[-1] = -max(-gain[-1], last)
+
+    return gain[0]
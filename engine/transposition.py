@@ -0,0 +1,67 @@
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+DEFAULT_SIZE_MB = 16
+# Rough footprint of one stored entry tuple plus its slot in the list.
+ENTRY_BYTES = 96
+
+
+class TranspositionTable:
+    """
+    Represents a fixed-size Transposition Table indexed by Zobrist key.
+
+    Entries are (key, depth, score, bound, move, generation) tuples. A new
+    entry replaces an old one unless the old one belongs to the current
+    search and was searched deeper.
+
+    Attributes:
+        size_mb (int): Approximate memory budget in megabytes.
+        generation (int): Counter bumped at the start of every search.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB) -> None:
+        self.generation = 0
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        """Reallocates the table, dropping every entry."""
+        self.size_mb = size_mb
+        self._slots = max(1, size_mb * 1024 * 1024 // ENTRY_BYTES)
+        self._entries = [None] * self._slots
+
+    def clear(self):
+        self._entries = [None] * self._slots
+        self.generation = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key):
+        """Returns the entry stored for the key, or None."""
+        entry = self._entries[key % self._slots]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        index = key % self._slots
+        entry = self._entries[index]
+        if (
+            entry is not None
+            and entry[0] != key
+            and entry[5] == self.generation
+            and entry[1] > depth
+        ):
+            return
+        if entry is not None and entry[0] == key and move is None:
+            move = entry[4]
+        self._entries[index] = (key, depth, score, bound, move, self.generation)
+
+    def hashfull(self):
+        """Returns how full the table is, in permille, from a sample of slots."""
+        sample = self._entries[:1000]
+        used = sum(
+            1 for entry in sample if entry is not None and entry[5] == self.generation
+        )
+        return used * 1000 // len(sample)
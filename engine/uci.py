@@ -0,0 +1,264 @@
+"""UCI protocol front end for the engine.
+
+The protocol loop runs on the main thread and only parses commands; every
+search runs on a worker thread, so `stop`, `ponderhit` and `isready` are
+answered while a search is in progress.
+"""
+
+import sys
+import threading
+
+from .notation import move_from_uci, move_to_uci
+from .position import START_FEN, Position
+from .search import MATE_SCORE, MAX_PLY, Search
+from .transposition import DEFAULT_SIZE_MB, TranspositionTable
+
+
+ENGINE_NAME = "TerminalChess"
+ENGINE_AUTHOR = "Vedant-Asati03"
+MAX_HASH_MB = 1024
+# Moves assumed to be left in the game when the GUI sends no movestogo.
+DEFAULT_MOVES_TO_GO = 30
+# Time kept in reserve for GUI and pipe latency, in milliseconds.
+MOVE_OVERHEAD_MS = 30
+# The search thread holds the GIL between checks; a short switch interval
+# lets the input thread pick up `stop` within a millisecond or two.
+SWITCH_INTERVAL = 0.001
+
+
+def format_score(score):
+    """Formats a search score as a UCI "cp" or "mate" score."""
+    if score >= MATE_SCORE - MAX_PLY:
+        return f"mate {(MATE_SCORE - score + 1) // 2}"
+    if score <= -MATE_SCORE + MAX_PLY:
+        return f"mate -{(MATE_SCORE + score) // 2}"
+    return f"cp {score}"
+
+
+class UciEngine:
+    """
+    Speaks the UCI protocol over a pair of text streams.
+
+    Attributes:
+        position (Position): The position set by the last `position` command.
+        transposition_table (TranspositionTable): Kept between searches.
+        threads (int): The Threads option; searches run on a single thread.
+    """
+
+    def __init__(self, input_stream=None, output_stream=None) -> None:
+        self.input_stream = input_stream or sys.stdin
+        self.output_stream = output_stream or sys.stdout
+        self.position = Position.from_fen(START_FEN)
+        self.transposition_table = TranspositionTable(DEFAULT_SIZE_MB)
+        self.threads = 1
+
+        self._output_lock = threading.Lock()
+        self._search = None
+        self._search_thread = None
+        self._release = threading.Event()
+        self._waiting = False
+        self._ponder_movetime = None
+
+    def send(self, line):
+        with self._output_lock:
+            self.output_stream.write(line + "\n")
+            self.output_stream.flush()
+
+    def run(self):
+        """Reads commands until `quit` or end of input."""
+        previous_interval = sys.getswitchinterval()
+        sys.setswitchinterval(SWITCH_INTERVAL)
+        try:
+            for line in self.input_stream:
+                if not self.handle(line):
+                    break
+        finally:
+            self._stop_search()
+            sys.setswitchinterval(previous_interval)
+
+    def handle(self, line):
+        """Handles one command line.
+
+        Returns:
+            bool: False once the engine should quit.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+
+        match command:
+            case "uci":
+                self.send(f"id name {ENGINE_NAME}")
+                self.send(f"id author {ENGINE_AUTHOR}")
+                self.send(
+                    f"option name Hash type spin default {DEFAULT_SIZE_MB} "
+                    f"min 1 max {MAX_HASH_MB}"
+                )
+                self.send("option name Threads type spin default 1 min 1 max 1")
+                self.send("option name Ponder type check default false")
+                self.send("uciok")
+            case "isready":
+                self.send("readyok")
+            case "ucinewgame":
+                self._stop_search()
+                self.transposition_table.clear()
+            case "setoption":
+                self._stop_search()
+                self._set_option(arguments)
+            case "position":
+                self._stop_search()
+                self._set_position(arguments)
+            case "go":
+                self._stop_search()
+                self._go(arguments)
+            case "stop":
+                self._stop_search()
+            case "ponderhit":
+                self._ponderhit()
+            case "quit":
+                return False
+
+        return True
+
+    def _set_option(self, arguments):
+        text = " ".join(arguments)
+        if not text.startswith("name ") or " value " not in text:
+            return
+        name, value = text[len("name "):].split(" value ", 1)
+        name = name.strip().lower()
+        if name not in ("hash", "threads"):
+            return
+        try:
+            value = int(value)
+        except ValueError:
+            self.send(f"info string ignoring invalid value {value.strip()} for {name}")
+            return
+
+        match name:
+            case "hash":
+                size_mb = min(max(value, 1), MAX_HASH_MB)
+                self.transposition_table.resize(size_mb)
+            case "threads":
+                self.threads = max(value, 1)
+
+    def _set_position(self, arguments):
+        if "moves" in arguments:
+            index = arguments.index("moves")
+            setup, moves = arguments[:index], arguments[index + 1:]
+        else:
+            setup, moves = arguments, []
+
+        if setup[:1] == ["fen"]:
+            # A bad FEN keeps the previous position, so the next `go` still
+            # has something legal to search.
+            try:
+                position = Position.from_fen(" ".join(setup[1:]))
+            except ValueError as error:
+                self.send(f"info string ignoring position: {error}")
+                return
+        else:
+            position = Position.from_fen(START_FEN)
+
+        for text in moves:
+            try:
+                position.make_move(move_from_uci(position, text))
+            except ValueError:
+                self.send(f"info string ignoring illegal move {text}")
+                break
+
+        self.position = position
+
+    def _allot_time(self, limits):
+        side = self.position.side
+        remaining = limits.get(f"{side}time")
+        if remaining is None:
+            return None
+
+        increment = limits.get(f"{side}inc", 0)
+        moves_to_go = limits.get("movestogo") or DEFAULT_MOVES_TO_GO
+        budget = remaining // moves_to_go + increment * 3 // 4
+        return max(1, min(budget, remaining // 2 - MOVE_OVERHEAD_MS))
+
+    def _go(self, arguments):
+        limits = {}
+        flags = set()
+        numeric = ("depth", "nodes", "movetime", "wtime", "btime", "winc", "binc", "movestogo")
+        index = 0
+        while index < len(arguments):
+            token = arguments[index]
+            if token in numeric and index + 1 < len(arguments):
+                # A bad limit is dropped but the search still runs: a GUI
+                # waits for bestmove after every go.
+                try:
+                    limits[token] = int(arguments[index + 1])
+                except ValueError:
+                    self.send(f"info string ignoring invalid {token} {arguments[index + 1]}")
+                index += 2
+                continue
+            if token in ("infinite", "ponder"):
+                flags.add(token)
+            index += 1
+
+        movetime = limits.get("movetime") or self._allot_time(limits)
+        pondering = "ponder" in flags
+        self._ponder_movetime = movetime if pondering else None
+        self._waiting = pondering or "infinite" in flags
+        self._release.clear()
+
+        self._search = Search(self.position.copy(), transposition_table=self.transposition_table)
+        self._search_thread = threading.Thread(
+            target=self._run_search,
+            args=(
+                self._search,
+                limits.get("depth", MAX_PLY),
+                limits.get("nodes"),
+                None if pondering else movetime,
+            ),
+            daemon=True,
+        )
+        self._search_thread.start()
+
+    def _run_search(self, search, depth, nodes, movetime):
+        def info(completed_depth, score, elapsed):
+            nodes_searched = search.stats.total_nodes
+            nps = int(nodes_searched / elapsed) if elapsed > 0 else 0
+            self.send(
+                f"info depth {completed_depth} score {format_score(score)} "
+                f"nodes {nodes_searched} nps {nps} time {int(elapsed * 1000)} "
+                f"hashfull {self.transposition_table.hashfull()} "
+                f"pv {' '.join(move_to_uci(move) for move in search.pv)}"
+            )
+
+        _, best_move = search.go(depth=depth, nodes=nodes, movetime=movetime, info=info)
+        # UCI info lines only carry the total; this shows how much of it
+        # went into quiescence.
+        self.send(f"info string {search.stats.summary()}")
+
+        # In infinite and ponder mode the best move may only be sent after
+        # `stop` or `ponderhit`, even if the search finished on its own.
+        if self._waiting:
+            self._release.wait()
+
+        if best_move is None:
+            self.send("bestmove 0000")
+        elif len(search.pv) > 1:
+            self.send(f"bestmove {move_to_uci(best_move)} ponder {move_to_uci(search.pv[1])}")
+        else:
+            self.send(f"bestmove {move_to_uci(best_move)}")
+
+    def _ponderhit(self):
+        if self._search is None:
+            return
+        self._search.set_time_limit(self._ponder_movetime)
+        self._waiting = False
+        self._release.set()
+
+    def _stop_search(self):
+        if self._search_thread is None:
+            return
+        self._search.stop()
+        self._release.set()
+        self._search_thread.join()
+        self._search_thread = None
+        self._search = None
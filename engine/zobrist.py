@@ -0,0 +1,63 @@
+"""Zobrist keys for incrementally hashed positions."""
+
+import random
+from itertools import combinations
+
+from .attacks import OPPOSITE, PAWN_ATTACKS
+
+
+_random = random.Random(0x7C4E55)
+
+PIECES = [color + kind for color in "wb" for kind in "pnbrqk"]
+PIECE_KEYS = {piece: [_random.getrandbits(64) for _ in range(64)] for piece in PIECES}
+SIDE_KEY = _random.getrandbits(64)
+EP_FILE_KEYS = [_random.getrandbits(64) for _ in range(8)]
+
+_CASTLING_RIGHT_KEYS = {right: _random.getrandbits(64) for right in "KQkq"}
+# Every castling string that can occur ("", "K", ..., "KQkq") -> its key.
+CASTLING_KEYS = {}
+for _count in range(5):
+    for _rights in combinations("KQkq", _count):
+        _key = 0
+        for _right in _rights:
+            _key ^= _CASTLING_RIGHT_KEYS[_right]
+        CASTLING_KEYS["".join(_rights)] = _key
+
+
+def ep_capture_possible(board, side, ep_square):
+    """Checks whether a pawn of `side` stands next to the en passant square.
+
+    Like Polyglot, only then is the en passant file part of the key, so the
+    same board hashes alike whether or not the last move was a double push
+    nobody can take.
+    """
+    if ep_square is None:
+        return False
+    pawn = side + "p"
+    # A pawn of `side` attacks the square from where an opposing pawn on it
+    # would attack.
+    return any(board[square] == pawn for square in PAWN_ATTACKS[OPPOSITE[side]][ep_square])
+
+
+def compute_hash(board, side, castling, ep_square):
+    """Computes the Zobrist key of a position from scratch.
+
+    Args:
+        board (list): The 64 square board.
+        side (str): The side to move.
+        castling (str): Castling rights in FEN order.
+        ep_square (int): The en passant target square, or None.
+
+    Returns:
+        int: The 64-bit key.
+    """
+    key = 0
+    for square, piece in enumerate(board):
+        if piece != " ":
+            key ^= PIECE_KEYS[piece][square]
+    if side == "b":
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[castling]
+    if ep_capture_possible(board, side, ep_square):
+        key ^= EP_FILE_KEYS[ep_square % 8]
+    return key
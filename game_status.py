@@ -0,0 +1,52 @@
+from engine.position import Position
+from engine.repetition import RepetitionHistory
+
+
+class GameStatus:
+    """
+    Represents the Termination State of a game played on the board.
+
+    The board list doesn't record captures or pawn moves, so the halfmove
+    clock is kept here from the moves reported to `update`.
+
+    Attributes:
+        halfmove_clock (int): Plies since the last capture or pawn move.
+        repetitions (RepetitionHistory): Hashes of the positions played.
+    """
+
+    def __init__(self, saved_game) -> None:
+        self.halfmove_clock = 0
+        self.repetitions = RepetitionHistory(Position.from_game(saved_game).hash)
+
+    def update(self, saved_game, side, piece_moved, captured):
+        """Records a move and checks whether it ended the game.
+
+        Args:
+            saved_game (list): The board after the move.
+            side (str): The side to move next, "w" or "b".
+            piece_moved (str): The piece as the player entered it, e.g. "p5".
+            captured (str): What stood on the target square before the
+                move, " " if it was empty.
+
+        Returns:
+            str: Why the game ended, or None if it goes on.
+        """
+        if piece_moved.startswith("p") or captured != " ":
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        position = Position.from_game(saved_game, side)
+        position.halfmove_clock = self.halfmove_clock
+        self.repetitions.push(position.hash)
+        position.repetitions = self.repetitions
+
+        if not position.has_legal_move():
+            if position.in_check():
+                return "checkmate"
+            return "stalemate"
+        if position.is_repetition(times=2):
+            return "threefold repetition"
+        if position.is_fifty_move_draw():
+            return "fifty-move rule"
+        return None
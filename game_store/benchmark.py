@@ -0,0 +1,119 @@
+"""Benchmarks PGN import throughput and position query latency.
+
+Run with `python -m game_store.benchmark --positions 1000000`. Without
+`--pgn`, random games are generated and written to a PGN file first, so
+the import is timed on parsing plus indexing.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from array import array
+
+from engine.position import START_FEN, Position
+from .pgn_store import GameRecord, PgnGameStore
+from .sqlite_store import SqliteGameStore
+
+
+PLAYERS = [f"player{index}" for index in range(50)]
+RESULTS = ("1-0", "0-1", "1/2-1/2")
+
+
+def random_games(positions, max_plies=120, seed=0):
+    """Generates random legal games until they reach `positions` positions."""
+    generator = random.Random(seed)
+    reached = 0
+    while reached < positions:
+        position = Position.from_fen(START_FEN)
+        moves = array("H")
+        for _ in range(generator.randint(20, max_plies)):
+            legal_moves = position.legal_moves()
+            if not legal_moves:
+                break
+            move = generator.choice(legal_moves)
+            position.make_move(move)
+            moves.append(move)
+        reached += len(moves) + 1
+        white, black = generator.sample(PLAYERS, 2)
+        yield GameRecord(white, black, generator.choice(RESULTS), moves)
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _time_queries(store, positions, query):
+    samples = []
+    for position in positions:
+        start = time.perf_counter()
+        query(position)
+        samples.append((time.perf_counter() - start) * 1000)
+    return (
+        f"median {statistics.median(samples):.3f} ms, "
+        f"p95 {_percentile(samples, 0.95):.3f} ms, max {max(samples):.3f} ms"
+    )
+
+
+def _sample_positions(store, count, seed=0):
+    generator = random.Random(seed)
+    game_count = store.connection.execute("SELECT MAX(id) FROM games").fetchone()[0]
+    positions = []
+    for _ in range(count):
+        game = store.get_game(generator.randint(1, game_count))
+        position = Position.from_fen(game.start_fen)
+        for move in game.moves[:generator.randint(0, len(game.moves))]:
+            position.make_move(move)
+        positions.append(position)
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite game store.")
+    parser.add_argument("--positions", type=int, default=1_000_000)
+    parser.add_argument("--pgn", help="import this PGN file instead of random games")
+    parser.add_argument("--database", help="database file; a temporary one by default")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pgn_path = args.pgn
+        if pgn_path is None:
+            pgn_path = os.path.join(directory, "games.pgn")
+            start = time.perf_counter()
+            PgnGameStore(pgn_path).append(random_games(args.positions))
+            print(f"generated {pgn_path} in {time.perf_counter() - start:.1f} s")
+
+        database = args.database or os.path.join(directory, "games.sqlite")
+        with SqliteGameStore(database) as store:
+            start = time.perf_counter()
+            games = store.import_pgn(pgn_path, args.batch_size)
+            elapsed = time.perf_counter() - start
+            positions = store.count_positions()
+            print(
+                f"imported {games} games, {positions} positions in {elapsed:.1f} s "
+                f"({games / elapsed:.0f} games/s, {positions / elapsed:.0f} positions/s)"
+            )
+
+            sample = _sample_positions(store, args.queries)
+            start_position = Position.from_fen(START_FEN)
+            print("games_reaching:   " + _time_queries(store, sample, store.games_reaching))
+            print("next_move_stats:  " + _time_queries(store, sample, store.next_move_stats))
+            print(
+                "player filter:    "
+                + _time_queries(
+                    store, sample, lambda position: store.games_reaching(position, player=PLAYERS[0])
+                )
+            )
+            print(
+                "start position:   "
+                + _time_queries(store, [start_position] * 20, store.next_move_stats)
+            )
+
+
+if __name__ == "__main__":
+    main()
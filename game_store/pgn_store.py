@@ -0,0 +1,211 @@
+import re
+from array import array
+
+from engine.notation import move_from_san, move_to_san
+from engine.position import START_FEN, Position
+
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+TAG_PATTERN = re.compile(r'\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]')
+# Comments, variations, NAGs and move numbers carry no moves.
+MOVETEXT_NOISE = re.compile(r"\{[^}]*\}|\$\d+|\d+\.(?:\.\.)?")
+
+
+class GameRecord:
+    """
+    Represents a finished Game.
+
+    Attributes:
+        white (str): Name of the white player.
+        black (str): Name of the black player.
+        result (str): "1-0", "0-1", "1/2-1/2" or "*".
+        moves (array): The packed moves played, typecode "H".
+        start_fen (str): The position the game started from.
+        termination (str): Why the game ended.
+        headers (dict): Any additional PGN tags.
+    """
+
+    def __init__(
+        self, white, black, result, moves, start_fen=START_FEN, termination=None,
+        headers=None,
+    ) -> None:
+        self.white = white
+        self.black = black
+        self.result = result
+        self.moves = moves
+        self.start_fen = start_fen
+        self.termination = termination
+        self.headers = headers or {}
+
+
+def _strip_variations(movetext):
+    depth, kept = 0, []
+    for char in movetext:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            kept.append(char)
+    return "".join(kept)
+
+
+def _build_game(tags, movetext):
+    start_fen = tags.pop("FEN", START_FEN)
+    tags.pop("SetUp", None)
+    position = Position.from_fen(start_fen)
+    moves = array("H")
+    for token in _strip_variations(MOVETEXT_NOISE.sub(" ", movetext)).split():
+        if token in RESULTS:
+            break
+        move = move_from_san(position, token)
+        position.make_move(move)
+        moves.append(move)
+
+    return GameRecord(
+        tags.pop("White", "?"),
+        tags.pop("Black", "?"),
+        tags.pop("Result", "*"),
+        moves,
+        start_fen,
+        tags.pop("Termination", None),
+        tags,
+    )
+
+
+def _try_build_game(tags, movetext):
+    # Position.from_fen and move_from_san report every malformed input as
+    # ValueError.
+    try:
+        return _build_game(tags, " ".join(movetext))
+    except ValueError:
+        return None
+
+
+def enumerate_games(lines, skip=0):
+    """Parses PGN text one game at a time, numbering every game in the text.
+
+    Games are numbered by their place in the text, including games that fail
+    to parse, so the numbers stay stable for resuming a long import.
+
+    Args:
+        lines (iterable): Lines of PGN text, e.g. an open file.
+        skip (int): Games to pass over without parsing or replaying them.
+
+    Yields:
+        tuple: (index, GameRecord), or (index, None) for a game with a
+            malformed FEN tag or an illegal or malformed move.
+    """
+    index = 0
+    tags, movetext = {}, []
+    for line in lines:
+        line = line.strip()
+        if line.startswith("[") and movetext:
+            if index >= skip:
+                yield index, _try_build_game(tags, movetext)
+            index += 1
+            tags, movetext = {}, []
+        if line.startswith("["):
+            match = TAG_PATTERN.match(line) if index >= skip else None
+            if match:
+                tags[match.group(1)] = match.group(2).replace('\\"', '"')
+        elif line and not line.startswith("%"):
+            movetext.append(line.split(";", 1)[0])
+
+    if (tags or movetext) and index >= skip:
+        yield index, _try_build_game(tags, movetext)
+
+
+def parse_games(lines):
+    """Parses PGN text one game at a time.
+
+    Games with a malformed FEN tag or an illegal or malformed move are
+    skipped, so a single bad game doesn't stop an archive import.
+
+    Args:
+        lines (iterable): Lines of PGN text, e.g. an open file.
+
+    Yields:
+        GameRecord: Each game, in file order.
+    """
+    for _, game in enumerate_games(lines):
+        if game is not None:
+            yield game
+
+
+class PgnGameStore:
+    """
+    Appends finished games to a PGN file and reads them back.
+
+    Attributes:
+        path (str): The PGN file games are appended to.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+
+    def format_game(self, game):
+        """Formats a game as PGN text.
+
+        Args:
+            game (GameRecord): The game to format.
+
+        Returns:
+            str: The PGN text, ending with a blank line.
+        """
+        tags = {"Event": "?", "White": game.white, "Black": game.black, "Result": game.result}
+        if game.start_fen != START_FEN:
+            tags["SetUp"] = "1"
+            tags["FEN"] = game.start_fen
+        if game.termination:
+            tags["Termination"] = game.termination
+        tags.update(game.headers)
+
+        fields = game.start_fen.split()
+        black_to_move = fields[1] == "b"
+        move_number = int(fields[5]) if len(fields) > 5 else 1
+
+        position = Position.from_fen(game.start_fen)
+        tokens = []
+        for ply, move in enumerate(game.moves):
+            white_move = (ply % 2 == 0) != black_to_move
+            if white_move:
+                tokens.append(f"{move_number}.")
+            elif ply == 0:
+                tokens.append(f"{move_number}...")
+            tokens.append(move_to_san(position, move))
+            position.make_move(move)
+            if not white_move:
+                move_number += 1
+        tokens.append(game.result)
+
+        lines = [f'[{name} "{value}"]' for name, value in tags.items()]
+        movetext, line = [], ""
+        for token in tokens:
+            if line and len(line) + len(token) + 1 > 79:
+                movetext.append(line)
+                line = token
+            else:
+                line = f"{line} {token}" if line else token
+        movetext.append(line)
+
+        return "\n".join(lines) + "\n\n" + "\n".join(movetext) + "\n\n"
+
+    def read(self):
+        """Reads the stored games lazily.
+
+        Yields:
+            GameRecord: Each game, in file order.
+        """
+        with open(self.path, encoding="utf-8") as pgn_file:
+            yield from parse_games(pgn_file)
+
+    def append(self, games):
+        """Appends one or more games to the store.
+
+        Args:
+            games (list): GameRecord objects.
+        """
+        with open(self.path, "a", encoding="utf-8") as pgn_file:
+            for game in games:
+                pgn_file.write(self.format_game(game))
@@ -0,0 +1,229 @@
+"""SQLite game store with every position indexed by its Zobrist hash.
+
+Finding the games that reached a position is a single index range scan on
+`positions`, instead of replaying every stored game.
+"""
+
+import sqlite3
+from array import array
+from itertools import islice
+
+from engine.notation import move_to_uci
+from engine.position import Position
+from .pgn_store import GameRecord, PgnGameStore
+
+
+DEFAULT_BATCH_SIZE = 500
+# SQLite integers are signed 64-bit; Zobrist keys are unsigned.
+SIGN_BIT = 1 << 63
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    white TEXT NOT NULL,
+    black TEXT NOT NULL,
+    result TEXT NOT NULL,
+    start_fen TEXT NOT NULL,
+    termination TEXT,
+    moves BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_white ON games (white);
+CREATE INDEX IF NOT EXISTS games_black ON games (black);
+CREATE TABLE IF NOT EXISTS positions (
+    hash INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    ply INTEGER NOT NULL,
+    next_move INTEGER,
+    PRIMARY KEY (hash, game_id, ply)
+) WITHOUT ROWID;
+"""
+
+
+def _to_key(position_hash):
+    return position_hash - (1 << 64) if position_hash >= SIGN_BIT else position_hash
+
+
+def _game_filter(white, black, player):
+    clauses, parameters = [], []
+    if white is not None:
+        clauses.append("games.white = ?")
+        parameters.append(white)
+    if black is not None:
+        clauses.append("games.black = ?")
+        parameters.append(black)
+    if player is not None:
+        clauses.append("(games.white = ? OR games.black = ?)")
+        parameters.extend((player, player))
+    return "".join(f" AND {clause}" for clause in clauses), parameters
+
+
+class PositionStats:
+    """
+    Represents how the games continued from a position with one move.
+
+    Attributes:
+        move (str): The move in UCI notation.
+        games (int): Games that played it.
+        white_wins (int): Of those, won by white.
+        draws (int): Of those, drawn.
+        black_wins (int): Of those, won by black.
+    """
+
+    def __init__(self, move, games, white_wins, draws, black_wins) -> None:
+        self.move = move
+        self.games = games
+        self.white_wins = white_wins
+        self.draws = draws
+        self.black_wins = black_wins
+
+    @property
+    def score(self):
+        """White's score with the move, from 0 to 1."""
+        return (self.white_wins + self.draws / 2) / self.games if self.games else 0.0
+
+
+class SqliteGameStore:
+    """
+    Stores games in SQLite, with every position they reach indexed by hash.
+
+    The database runs in WAL mode, so readers keep working during an import.
+
+    Attributes:
+        path (str): The database file.
+        connection (sqlite3.Connection): The open connection.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_games(self, games, batch_size=DEFAULT_BATCH_SIZE):
+        """Stores games, committing one transaction per batch.
+
+        Args:
+            games (iterable): GameRecord objects; may be a lazy generator.
+            batch_size (int): Games per transaction.
+
+        Returns:
+            int: The number of games stored.
+        """
+        games = iter(games)
+        stored = 0
+        while batch := list(islice(games, batch_size)):
+            self._insert_batch(batch)
+            stored += len(batch)
+        return stored
+
+    def import_pgn(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        """Imports every game of a PGN file; returns the number imported."""
+        return self.add_games(PgnGameStore(path).read(), batch_size)
+
+    def _insert_batch(self, games):
+        rows = []
+        with self.connection:
+            for game in games:
+                cursor = self.connection.execute(
+                    "INSERT INTO games (white, black, result, start_fen, termination, moves) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        game.white,
+                        game.black,
+                        game.result,
+                        game.start_fen,
+                        game.termination,
+                        array("H", game.moves).tobytes(),
+                    ),
+                )
+                game_id = cursor.lastrowid
+
+                position = Position.from_fen(game.start_fen)
+                for ply, move in enumerate(game.moves):
+                    rows.append((_to_key(position.hash), game_id, ply, move))
+                    position.make_move(move)
+                rows.append((_to_key(position.hash), game_id, len(game.moves), None))
+
+            self.connection.executemany(
+                "INSERT INTO positions (hash, game_id, ply, next_move) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def get_game(self, game_id):
+        """Loads a stored game, or returns None."""
+        row = self.connection.execute(
+            "SELECT white, black, result, start_fen, termination, moves FROM games "
+            "WHERE id = ?",
+            (game_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        white, black, result, start_fen, termination, moves = row
+        return GameRecord(white, black, result, array("H", moves), start_fen, termination)
+
+    def count_positions(self):
+        return self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def games_reaching(self, position, white=None, black=None, player=None, limit=100):
+        """Finds the stored games that reached a position.
+
+        Args:
+            position (Position): The position to look up.
+            white (str): Only games with this white player.
+            black (str): Only games with this black player.
+            player (str): Only games this player took part in, either color.
+            limit (int): Maximum number of games returned.
+
+        Returns:
+            list: (game_id, ply, white, black, result) tuples, first reached
+                ply per game.
+        """
+        condition, parameters = _game_filter(white, black, player)
+        return self.connection.execute(
+            "SELECT positions.game_id, MIN(positions.ply), games.white, games.black, "
+            "games.result FROM positions JOIN games ON games.id = positions.game_id "
+            f"WHERE positions.hash = ?{condition} "
+            "GROUP BY positions.game_id ORDER BY positions.game_id LIMIT ?",
+            (_to_key(position.hash), *parameters, limit),
+        ).fetchall()
+
+    def next_move_stats(self, position, white=None, black=None, player=None):
+        """Counts the moves played from a position and how those games ended.
+
+        Args:
+            position (Position): The position to look up.
+            white (str): Only games with this white player.
+            black (str): Only games with this black player.
+            player (str): Only games this player took part in, either color.
+
+        Returns:
+            list: PositionStats, most played first.
+        """
+        condition, parameters = _game_filter(white, black, player)
+        # A game that reaches the position twice and plays the same move
+        # both times still counts once for that move.
+        rows = self.connection.execute(
+            "SELECT played.next_move, COUNT(*), "
+            "SUM(games.result = '1-0'), SUM(games.result = '1/2-1/2'), "
+            "SUM(games.result = '0-1') "
+            "FROM (SELECT DISTINCT game_id, next_move FROM positions "
+            "WHERE hash = ? AND next_move IS NOT NULL) AS played "
+            f"JOIN games ON games.id = played.game_id WHERE 1{condition} "
+            "GROUP BY played.next_move ORDER BY COUNT(*) DESC",
+            (_to_key(position.hash), *parameters),
+        ).fetchall()
+        return [
+            PositionStats(move_to_uci(move), games, white_wins, draws, black_wins)
+            for move, games, white_wins, draws, black_wins in rows
+        ]
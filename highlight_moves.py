@@ -11,11 +11,17 @@ class GenerateAlgebraicNotation:
                 self.square_algebraic_notation.append(f"{file}{rank}")
 
 
+MOVE_SQUARE_COLOR = "#BBCB44"
+PREVIOUS_SQUARE_COLOR = "#F5F67F"
+CHECK_SQUARE_COLOR = "#E84A4A"
+
+
 class HighlightMove:
 
-    def __init__(self, move, previous_square):
+    def __init__(self, move, previous_square, check_square=None):
         self.move = move
         self.previous_square = previous_square
+        self.check_square = check_square
         self.algebraic_notation = GenerateAlgebraicNotation()
 
     def highlight_move(self, i, j):
@@ -29,17 +35,17 @@ class HighlightMove:
             str: The background color for highlighting the move.
         """
 
+        if self.check_square == i * 8 + j:
+            return CHECK_SQUARE_COLOR
+
         if self.previous_square is None:
             return None
 
-        if (
-            self.algebraic_notation.square_algebraic_notation[i * 8 + j] == self.move
-            and self.updated_game is not None
-        ):
-            return "#BBCB44"
+        if self.algebraic_notation.square_algebraic_notation[i * 8 + j] == self.move:
+            return MOVE_SQUARE_COLOR
         if (
             self.algebraic_notation.square_algebraic_notation[i * 8 + j]
             == self.previous_square
         ):
-            return "#F5F67F"
+            return PREVIOUS_SQUARE_COLOR
         return None
@@ -45,6 +45,12 @@ class ValidateMove:
             f"[#C51605]{self.params.move.piece_moved} can't move to {self.params.move.move}"
         )
 
+    def _show_king_in_check_message(self):
+        self.console.print(
+            f"[#C51605]{self.params.move.piece_moved} can't move to {self.params.move.move}, "
+            "your king would be in check"
+        )
+
     def _is_same_color_piece(self, restricted_moves, target_cell_index, replaced_piece):
         return restricted_moves.check_for_same_color_piece(
             target_cell_index, replaced_piece
@@ -109,4 +115,8 @@ class ValidateMove:
             self._show_piece_cannot_move_message()
             return [None, algebraic_position]
 
+        if restricted_moves.leaves_king_in_check(saved_game):
+            self._show_king_in_check_message()
+            return [None, algebraic_position]
+
         return [saved_game, algebraic_position]
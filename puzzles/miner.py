@@ -0,0 +1,307 @@
+"""Mines tactic puzzles from a PGN archive.
+
+A puzzle is a position with exactly one clearly winning move. Every game
+is replayed and each position gets a cheap shallow search; only positions
+that pass it are verified with a deeper one.
+
+Puzzles are written in game order, one per line as
+"FEN<TAB>solution in UCI<TAB>game number<TAB>ply", and a checkpoint is
+saved after each batch so an interrupted run resumes where it stopped.
+
+Example:
+    python -m puzzles.miner games.pgn puzzles.tsv --workers 8
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from engine.evaluate import evaluate
+from engine.notation import move_to_uci
+from engine.position import Position
+from engine.search import Search
+from engine.transposition import TranspositionTable
+from game_store.pgn_store import enumerate_games
+
+
+class MinerConfig:
+    """
+    Represents the thresholds and search effort used to find puzzles.
+
+    Attributes:
+        first_ply (int): Positions before this ply are skipped as opening.
+        shallow_depth (int): Depth of the filtering search.
+        deep_depth (int): Depth of the verification search.
+        winning_score (int): Centipawns the best move must reach.
+        second_best_limit (int): Centipawns the second-best move must stay
+            under, so that only one move wins.
+        solution_length (int): Maximum plies of the solution line.
+        table_mb (int): Transposition table size per game.
+    """
+
+    def __init__(
+        self, first_ply=10, shallow_depth=2, deep_depth=4, winning_score=300,
+        second_best_limit=50, solution_length=6, table_mb=4,
+    ) -> None:
+        self.first_ply = first_ply
+        self.shallow_depth = shallow_depth
+        self.deep_depth = deep_depth
+        self.winning_score = winning_score
+        self.second_best_limit = second_best_limit
+        self.solution_length = solution_length
+        self.table_mb = table_mb
+
+
+class Puzzle:
+    """
+    Represents a Puzzle.
+
+    Attributes:
+        fen (str): The position, with the solver to move.
+        solution (list): The winning line as packed moves.
+        game_number (int): Index of the source game in the archive, counting
+            games that failed to parse.
+        ply (int): Ply of the position in the source game.
+    """
+
+    def __init__(self, fen, solution, game_number, ply) -> None:
+        self.fen = fen
+        self.solution = solution
+        self.game_number = game_number
+        self.ply = ply
+
+    def to_line(self):
+        solution = " ".join(move_to_uci(move) for move in self.solution)
+        return f"{self.fen}\t{solution}\t{self.game_number}\t{self.ply}\n"
+
+
+def _single_winning_move(search, depth, config):
+    """Returns the winning line if exactly one move wins at this depth."""
+    search.go(depth=depth, multi_pv=2)
+    lines = search.lines
+    if not lines or lines[0][0] < config.winning_score:
+        return None
+    if len(lines) > 1 and lines[1][0] >= config.second_best_limit:
+        return None
+    return lines[0][1]
+
+
+def mine_game(game_number, game, config):
+    """Finds the puzzles in one game.
+
+    Args:
+        game_number (int): Index of the game in the archive.
+        game (GameRecord): The game.
+        config (MinerConfig): Thresholds and search depths.
+
+    Returns:
+        list: Puzzle objects, in ply order.
+    """
+    table = TranspositionTable(config.table_mb)
+    position = Position.from_fen(game.start_fen)
+    puzzles = []
+
+    for ply, played in enumerate(game.moves):
+        # Positions that are already won without a tactic make poor puzzles.
+        if ply >= config.first_ply and abs(evaluate(position)) < config.winning_score:
+            search = Search(position.copy(), transposition_table=table)
+            if _single_winning_move(search, config.shallow_depth, config) is not None:
+                solution = _single_winning_move(search, config.deep_depth, config)
+                if solution is not None:
+                    puzzles.append(
+                        Puzzle(
+                            position.to_fen(),
+                            solution[:config.solution_length],
+                            game_number,
+                            ply,
+                        )
+                    )
+        position.make_move(played)
+
+    return puzzles
+
+
+def _mine_task(task):
+    game_number, game, config = task
+    return game_number, mine_game(game_number, game, config)
+
+
+class PuzzleMiner:
+    """
+    Mines puzzles from a PGN file over a process pool.
+
+    Attributes:
+        pgn_path (str): The archive to read.
+        output_path (str): The puzzle file, appended to.
+        checkpoint_path (str): Where progress is saved for resuming.
+        config (MinerConfig): Thresholds and search depths.
+        workers (int): Worker processes; defaults to the CPU count.
+    """
+
+    def __init__(
+        self, pgn_path, output_path, checkpoint_path=None, config=None, workers=None
+    ) -> None:
+        self.pgn_path = pgn_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+        self.config = config or MinerConfig()
+        self.workers = workers
+
+    def _archive(self):
+        return {"pgn": os.path.abspath(self.pgn_path), "pgn_size": os.path.getsize(self.pgn_path)}
+
+    def _load_checkpoint(self):
+        """Loads the checkpoint, refusing to resume anything it doesn't match.
+
+        Raises:
+            ValueError: If the checkpoint belongs to another archive, or the
+                output has puzzles the checkpoint doesn't account for.
+        """
+        output_size = (
+            os.path.getsize(self.output_path) if os.path.exists(self.output_path) else 0
+        )
+        if not os.path.exists(self.checkpoint_path):
+            if output_size:
+                raise ValueError(
+                    f"{self.output_path} already has puzzles but no checkpoint at "
+                    f"{self.checkpoint_path}; refusing to overwrite it"
+                )
+            return {**self._archive(), "games": 0, "puzzles": 0, "offset": 0}
+
+        with open(self.checkpoint_path, encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        archive = self._archive()
+        if any(checkpoint.get(key) != value for key, value in archive.items()):
+            raise ValueError(
+                f"{self.checkpoint_path} was written for {checkpoint.get('pgn')} "
+                f"({checkpoint.get('pgn_size')} bytes), not {archive['pgn']} "
+                f"({archive['pgn_size']} bytes)"
+            )
+        if output_size < checkpoint["offset"]:
+            raise ValueError(
+                f"{self.output_path} is shorter than {self.checkpoint_path} records"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint):
+        # Written to a temporary file and renamed, so a crash never leaves
+        # a half-written checkpoint behind.
+        temporary_path = self.checkpoint_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def _write_finished(self, checkpoint, finished, output_file, progress):
+        """Writes the finished games that continue the checkpoint, in order."""
+        if checkpoint["games"] not in finished:
+            return
+        while checkpoint["games"] in finished:
+            puzzles = finished.pop(checkpoint["games"])
+            output_file.writelines(puzzle.to_line() for puzzle in puzzles)
+            checkpoint["games"] += 1
+            checkpoint["puzzles"] += len(puzzles)
+        output_file.flush()
+        os.fsync(output_file.fileno())
+        checkpoint["offset"] = output_file.tell()
+        self._save_checkpoint(checkpoint)
+        if progress is not None:
+            progress(checkpoint)
+
+    def run(self, progress=None):
+        """Mines the whole archive, resuming from the checkpoint if present.
+
+        Args:
+            progress (callable): Called with the checkpoint after each save.
+
+        Returns:
+            dict: The final checkpoint: the archive, games done (counting
+                games that failed to parse), puzzles found and the size of
+                the output file.
+
+        Raises:
+            ValueError: If the checkpoint doesn't match the archive or output.
+        """
+        checkpoint = self._load_checkpoint()
+        workers = self.workers or os.cpu_count() or 1
+        # Caps the games being mined plus the results held back for in-order
+        # writing, so memory doesn't grow with the archive even when an early
+        # game is slow.
+        limit = 2 * workers
+
+        with (
+            open(self.pgn_path, encoding="utf-8") as pgn_file,
+            open(self.output_path, "a+", encoding="utf-8") as output_file,
+            ProcessPoolExecutor(max_workers=workers) as executor,
+        ):
+            # Puzzles written after the last checkpoint are dropped, since
+            # their games are mined again.
+            output_file.truncate(checkpoint["offset"])
+            output_file.seek(checkpoint["offset"])
+
+            # Games are numbered by their place in the archive, counting
+            # unparsable ones, so the checkpoint always skips the same games.
+            games = enumerate_games(pgn_file, skip=checkpoint["games"])
+            finished = {}
+            in_flight = set()
+            exhausted = False
+
+            while True:
+                # The bound is checked before taking a game, so a slow early
+                # game stops submission instead of piling up results.
+                while not exhausted and len(in_flight) + len(finished) < limit:
+                    item = next(games, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    game_number, game = item
+                    if game is None:
+                        finished[game_number] = []
+                    else:
+                        in_flight.add(
+                            executor.submit(_mine_task, (game_number, game, self.config))
+                        )
+
+                if in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        game_number, puzzles = future.result()
+                        finished[game_number] = puzzles
+
+                self._write_finished(checkpoint, finished, output_file, progress)
+                if exhausted and not in_flight and not finished:
+                    break
+
+        return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mine tactic puzzles from a PGN archive.")
+    parser.add_argument("pgn", help="the game archive")
+    parser.add_argument("output", help="puzzle file; appended to when resuming")
+    parser.add_argument("--checkpoint", help="defaults to OUTPUT.checkpoint")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--shallow-depth", type=int, default=2)
+    parser.add_argument("--deep-depth", type=int, default=4)
+    parser.add_argument("--first-ply", type=int, default=10)
+    args = parser.parse_args()
+
+    config = MinerConfig(
+        first_ply=args.first_ply,
+        shallow_depth=args.shallow_depth,
+        deep_depth=args.deep_depth,
+    )
+    miner = PuzzleMiner(args.pgn, args.output, args.checkpoint, config, args.workers)
+    try:
+        result = miner.run(
+            progress=lambda checkpoint: print(
+                f"games {checkpoint['games']} puzzles {checkpoint['puzzles']}", flush=True
+            )
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"done: {result['games']} games, {result['puzzles']} puzzles")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from determine_piece_color import DeterminePieceColor
+from engine.position import Position
 
 
 class RestrictedInvalidMoves:
@@ -60,6 +61,20 @@ class RestrictedInvalidMoves:
 
         return None
 
+    def leaves_king_in_check(self, saved_game):
+        """Checks if the move leaves the player's own king attacked
+        (for every move).
+
+        Returns:
+            bool: True if the king would be in check, None otherwise.
+        """
+        position = Position.from_game(saved_game, self.piece_color)
+
+        if position.attack_state.in_check:
+            return True
+
+        return None
+
     def jumping_over_pieces(self, current_position):
         if self.piece_colored[1] == "n":  # Knights can jump over pieces
             return None
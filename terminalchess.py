@@ -1,6 +1,7 @@
 """TerminalChess game"""
 
 from itertools import cycle
+import argparse
 import os
 
 from rich import print
@@ -16,6 +17,10 @@ from create_board.create_board import CreateBoard
 from highlight_moves import GenerateAlgebraicNotation
 from move_piece.params import Params
 from move_piece.move_piece import MovePiece
+from engine.analysis import AnalysisSession
+from engine.position import Position
+from engine.uci import UciEngine
+from game_status import GameStatus
 # from display_valid_moves import DisplayValidMoves
 
 
@@ -54,6 +59,17 @@ def clear_terminal():
     os.system("cls" if os.name == "nt" else "clear")
 
 
+def show_analysis(console, session, saved_game, side, status):
+    """Prints the engine's best lines for the position on the board."""
+    position = Position.from_game(saved_game, side)
+    position.halfmove_clock = status.halfmove_clock
+    position.repetitions = status.repetitions.copy()
+    result = session.analyse(position)
+    console.print(f"\n[#F6F4EB on #302E2A]Analysis (depth {result.depth})")
+    for line in session.report(position, result):
+        console.print(line)
+
+
 def main():
     console = Console()
     panel = Panel(Text("CHESS", style="#EEEDED on #557A46"), padding=1)
@@ -67,16 +83,31 @@ def main():
     player_cycle = cycle([white, black])
 
     game = CreateBoard(None, None, None, Player(white, black, None))
+    status = GameStatus(game.piece.game)
 
     # Initial board display
     clear_terminal()
     game.create_board()  # Let it print directly
 
+    # Type "analyse" to toggle analysis mode; the session outlives the
+    # toggle so switching it back on doesn't start cold.
+    analysis = AnalysisSession()
+    analysing = False
+
     for player in player_cycle:
         color = "[#EEEDED on #557A46]" if player == white else "[#000000 on #FFFFE8]"
+        side = "w" if player == white else "b"
+        if analysing:
+            show_analysis(console, analysis, game.piece.game, side, status)
         while True:
             try:
                 move_input = console.input(f"\n{color}Make a move: ").strip().casefold()
+                if move_input in ("analyse", "analyze"):
+                    analysing = not analysing
+                    console.print(f"Analysis mode {'on' if analysing else 'off'}")
+                    if analysing:
+                        show_analysis(console, analysis, game.piece.game, side, status)
+                    continue
                 piece, move = move_input.split(" ")
             except ValueError:
                 console.print("[red]Invalid input! Format should be 'piece move'[/red]")
@@ -92,6 +123,7 @@ def main():
             updated_piece = MovePiece(params).move_piece()
 
             if updated_piece[0] is not None:
+                captured = game.piece.game[params.cell_name.index(move)]
                 game.updated_game = updated_piece[0]
                 game.previous_square = updated_piece[1]
                 game.move = move
@@ -100,10 +132,28 @@ def main():
                 # Clear the terminal and display the updated board
                 clear_terminal()
                 game.create_board()  # Let it print directly
+
+                next_side = "b" if player == white else "w"
+                termination = status.update(game.piece.game, next_side, piece, captured)
+                if termination == "checkmate":
+                    console.print(f"\n[#EEEDED on #557A46]Checkmate! {player} wins.")
+                    return
+                if termination is not None:
+                    console.print(f"\n[#000000 on #FFFFE8]Draw by {termination}.")
+                    return
                 break
             else:
                 console.print("[red]Invalid move! Try again.[/red]")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="TerminalChess game")
+    parser.add_argument(
+        "--uci", action="store_true", help="speak the UCI protocol on stdin/stdout"
+    )
+    args = parser.parse_args()
+
+    if args.uci:
+        UciEngine().run()
+    else:
+        main()
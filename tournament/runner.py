@@ -0,0 +1,308 @@
+"""Headless engine-vs-engine tournaments.
+
+Example:
+    python -m tournament.runner --games 200 --nodes 5000 --second quiescence=false
+"""
+
+import argparse
+import os
+import random
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from engine.position import Position
+from engine.search import Search
+from engine.transposition import TranspositionTable
+from game_store.pgn_store import GameRecord, PgnGameStore
+from .openings import OPENINGS
+from .sprt import SPRT, elo_difference
+
+
+# Two random plies turn the opening suite into thousands of distinct starts.
+DEFAULT_RANDOM_PLIES = 2
+
+class EngineConfig:
+    """
+    Represents an engine setup taking part in a tournament.
+
+    Attributes:
+        name (str): Name used in the game records.
+        options (dict): Keyword arguments passed to `Search`.
+    """
+
+    def __init__(self, name, options=None) -> None:
+        self.name = name
+        self.options = options or {}
+
+
+class TournamentResult:
+    """
+    Represents the score of the first engine against the second.
+
+    Attributes:
+        wins (int): Games won by the first engine.
+        draws (int): Drawn games.
+        losses (int): Games lost by the first engine.
+        sprt_status (str): "H1", "H0" or None if the test did not finish.
+        llr (float): Final SPRT log likelihood ratio.
+    """
+
+    def __init__(self) -> None:
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.sprt_status = None
+        self.llr = 0.0
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def summary(self):
+        elo, margin = elo_difference(self.wins, self.draws, self.losses)
+        return (
+            f"games {self.games} +{self.wins} ={self.draws} -{self.losses} "
+            f"elo {elo:+.1f} +/- {margin:.1f} llr {self.llr:.2f} "
+            f"sprt {self.sprt_status or 'unfinished'}"
+        )
+
+
+def _insufficient_material(board):
+    pieces = [piece[1] for piece in board if piece != " " and piece[1] != "k"]
+    return not pieces or (len(pieces) == 1 and pieces[0] in "nb")
+
+
+def _game_over(position):
+    if not position.has_legal_move():
+        if position.in_check():
+            return ("0-1" if position.side == "w" else "1-0"), "checkmate"
+        return "1/2-1/2", "stalemate"
+    if position.is_fifty_move_draw():
+        return "1/2-1/2", "fifty-move rule"
+    if position.is_repetition(times=2):
+        return "1/2-1/2", "threefold repetition"
+    if _insufficient_material(position.board):
+        return "1/2-1/2", "insufficient material"
+    return None
+
+
+def play_game(white, black, start_fen, nodes=None, movetime=None, max_plies=400):
+    """Plays one game between two engine setups without any terminal output.
+
+    Args:
+        white (EngineConfig): The engine playing white.
+        black (EngineConfig): The engine playing black.
+        start_fen (str): The opening position.
+        nodes (int): Node budget per move.
+        movetime (int): Time budget per move in milliseconds.
+        max_plies (int): Games still running after this many plies are drawn.
+
+    Returns:
+        GameRecord: The finished game.
+    """
+    position = Position.from_fen(start_fen)
+    engines = {"w": white, "b": black}
+    tables = {"w": TranspositionTable(), "b": TranspositionTable()}
+    moves = array("H")
+
+    while True:
+        outcome = _game_over(position)
+        if outcome is None and len(moves) >= max_plies:
+            outcome = "1/2-1/2", "adjudicated"
+        if outcome is not None:
+            break
+
+        engine = engines[position.side]
+        search = Search(
+            position.copy(), transposition_table=tables[position.side], **engine.options
+        )
+        _, move = search.go(nodes=nodes, movetime=movetime)
+        position.make_move(move)
+        moves.append(move)
+
+    result, termination = outcome
+    return GameRecord(white.name, black.name, result, moves, start_fen, termination)
+
+
+def _play_task(task):
+    first_is_white, first, second, start_fen, nodes, movetime = task
+    white, black = (first, second) if first_is_white else (second, first)
+    return first_is_white, play_game(white, black, start_fen, nodes, movetime)
+
+
+class TournamentRunner:
+    """
+    Plays engine-vs-engine games in parallel worker processes.
+
+    Attributes:
+        first (EngineConfig): The engine being tested.
+        second (EngineConfig): The reference engine.
+        games (int): Maximum number of games.
+        nodes (int): Node budget per move.
+        movetime (int): Time budget per move in milliseconds.
+        workers (int): Number of worker processes.
+        store (PgnGameStore): Where finished games are written, if anywhere.
+        sprt (SPRT): Early stopping test, if any.
+        openings (list): FENs the games start from.
+        random_plies (int): Random moves played from the opening before each
+            pair of games.
+        seed (int): Seed of those random moves, so a tournament can be
+            replayed.
+    """
+
+    def __init__(
+        self, first, second, games=100, nodes=None, movetime=None, workers=None,
+        store=None, sprt=None, openings=None, random_plies=DEFAULT_RANDOM_PLIES, seed=0,
+    ) -> None:
+        self.first = first
+        self.second = second
+        self.games = games
+        self.nodes = nodes
+        self.movetime = movetime
+        self.workers = workers
+        self.store = store
+        self.sprt = sprt
+        self.openings = openings or OPENINGS
+        self.random_plies = random_plies
+        self.seed = seed
+
+    def _start_fen(self, pair):
+        """Returns the start of a pair of games: an opening plus random moves.
+
+        Searches with a node budget are deterministic, so without the random
+        moves every repeat of an opening would replay the same two games and
+        the SPRT would count copies as independent results.
+        """
+        rng = random.Random(f"{self.seed}/{pair}")
+        position = Position.from_fen(self.openings[pair % len(self.openings)])
+        for _ in range(self.random_plies):
+            moves = position.legal_moves()
+            if not moves:
+                break
+            position.make_move(rng.choice(moves))
+        # A random move can end the game; the plain opening is used then.
+        if _game_over(position) is not None:
+            return self.openings[pair % len(self.openings)]
+        return position.to_fen()
+
+    def _tasks(self):
+        for index in range(self.games):
+            if index % 2 == 0:
+                start_fen = self._start_fen(index // 2)
+            yield (
+                index % 2 == 0, self.first, self.second, start_fen,
+                self.nodes, self.movetime,
+            )
+
+    def _record(self, result, first_is_white, game):
+        if game.result == "1/2-1/2":
+            result.draws += 1
+        elif (game.result == "1-0") == first_is_white:
+            result.wins += 1
+        else:
+            result.losses += 1
+
+        if self.store is not None:
+            self.store.append([game])
+
+    def run(self, progress=None):
+        """Plays the tournament, stopping early once the SPRT decides.
+
+        Args:
+            progress (callable): Called with the running result after each game.
+
+        Returns:
+            TournamentResult: The final score.
+        """
+        result = TournamentResult()
+        tasks = self._tasks()
+
+        workers = self.workers or os.cpu_count() or 1
+        # Only a couple of games per worker are queued at any time, so an
+        # early SPRT stop doesn't leave a long backlog to cancel.
+        limit = 2 * workers
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = set()
+
+            while True:
+                for task in tasks:
+                    in_flight.add(executor.submit(_play_task, task))
+                    if len(in_flight) >= limit:
+                        break
+                if not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._record(result, *future.result())
+
+                if self.sprt is not None:
+                    result.llr = self.sprt.llr(result.wins, result.draws, result.losses)
+                    result.sprt_status = self.sprt.status(
+                        result.wins, result.draws, result.losses
+                    )
+                if progress is not None:
+                    progress(result)
+                if result.sprt_status:
+                    for future in in_flight:
+                        future.cancel()
+                    break
+
+        return result
+
+
+def _parse_options(pairs):
+    options = {}
+    for pair in pairs or []:
+        key, value = pair.split("=", 1)
+        if value.lower() in ("true", "false"):
+            options[key] = value.lower() == "true"
+        elif value.lstrip("-").isdigit():
+            options[key] = int(value)
+        else:
+            options[key] = value
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an engine-vs-engine tournament.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--nodes", type=int, help="node budget per move")
+    parser.add_argument("--movetime", type=int, help="milliseconds per move")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--pgn", help="append finished games to this PGN file")
+    parser.add_argument("--first", nargs="*", metavar="KEY=VALUE", help="Search options")
+    parser.add_argument("--second", nargs="*", metavar="KEY=VALUE", help="Search options")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=5.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument(
+        "--random-plies", type=int, default=DEFAULT_RANDOM_PLIES,
+        help="random moves played from the opening before each pair of games",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random moves")
+    args = parser.parse_args()
+
+    if args.nodes is None and args.movetime is None:
+        args.nodes = 2000
+
+    runner = TournamentRunner(
+        EngineConfig("first", _parse_options(args.first)),
+        EngineConfig("second", _parse_options(args.second)),
+        games=args.games,
+        nodes=args.nodes,
+        movetime=args.movetime,
+        workers=args.workers,
+        store=PgnGameStore(args.pgn) if args.pgn else None,
+        sprt=SPRT(args.elo0, args.elo1, args.alpha, args.beta),
+        random_plies=args.random_plies,
+        seed=args.seed,
+    )
+    result = runner.run(progress=lambda result: print(result.summary(), flush=True))
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import math
+
+
+def expected_score(elo):
+    """Expected score for a player rated `elo` points above the opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_difference(wins, draws, losses):
+    """Estimates the Elo difference and its 95% error margin.
+
+    Args:
+        wins (int): Games won by the first engine.
+        draws (int): Drawn games.
+        losses (int): Games lost by the first engine.
+
+    Returns:
+        tuple: (elo, margin); both 0.0 before any game has been played.
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0, 0.0
+
+    score = (wins + draws / 2) / games
+    variance = (wins + draws / 4) / games - score**2
+    deviation = math.sqrt(max(variance, 0.0) / games)
+
+    def to_elo(value):
+        value = min(max(value, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / value - 1)
+
+    elo = to_elo(score)
+    margin = (to_elo(score + 1.96 * deviation) - to_elo(score - 1.96 * deviation)) / 2
+    return elo, margin
+
+
+class SPRT:
+    """
+    Represents a Sequential Probability Ratio Test between two Elo hypotheses.
+
+    Uses the normal approximation of the trinomial (win/draw/loss) log
+    likelihood ratio, which is what most engine testing frameworks use.
+
+    Attributes:
+        elo0 (float): Elo difference under H0.
+        elo1 (float): Elo difference under H1.
+        lower_bound (float): LLR at which H0 is accepted.
+        upper_bound (float): LLR at which H1 is accepted.
+    """
+
+    def __init__(self, elo0=0.0, elo1=5.0, alpha=0.05, beta=0.05) -> None:
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+
+    def llr(self, wins, draws, losses):
+        """Returns the log likelihood ratio of H1 against H0."""
+        games = wins + draws + losses
+        if not games:
+            return 0.0
+
+        score = (wins + draws / 2) / games
+        variance = (wins + draws / 4) / games - score**2
+        if variance <= 0:
+            # Only one kind of result so far (a clean sweep, or all draws):
+            # one pseudo-win and one pseudo-loss give the variance a value
+            # without moving the score towards either side.
+            wins, losses, games = wins + 1, losses + 1, games + 2
+            score = (wins + draws / 2) / games
+            variance = (wins + draws / 4) / games - score**2
+
+        score0 = expected_score(self.elo0)
+        score1 = expected_score(self.elo1)
+        return (score1 - score0) * (2 * score - score0 - score1) / (2 * variance / games)
+
+    def status(self, wins, draws, losses):
+        """Returns "H1", "H0" or None while the test is still running."""
+        llr = self.llr(wins, draws, losses)
+        if llr >= self.upper_bound:
+            return "H1"
+        if llr <= self.lower_bound:
+            return "H0"
+        return None